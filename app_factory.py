@@ -0,0 +1,234 @@
+"""
+FastAPI application factory shared by the ChatKit samples.
+
+Builds the app every use case exposes: lifespan, CORS, the /chatkit
+endpoint, health and branding endpoints, and the frontend and static files.
+Each entry point (main.py, main_retail.py) only supplies its store, its
+ChatKit server and its payloads.
+"""
+
+import logging
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import anyio.to_thread
+import orjson
+from fastapi import FastAPI, Request, Response
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import HTMLResponse, StreamingResponse, FileResponse, ORJSONResponse
+from fastapi.staticfiles import StaticFiles
+
+from chatkit.server import ChatKitServer, StreamingResult
+from chatkit.store import Store
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Worker threads available for sync code run off the event loop (anyio default: 40)
+THREAD_POOL_TOKENS = 200
+
+# ChatKit's StreamingResult already yields encoded b"data: ...\n\n" frames,
+# so the response streams them as-is; only the headers are shared here
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",  # Disable nginx buffering
+}
+
+# Cap on the buffer allocated up front from Content-Length: the header is
+# client-supplied, so anything larger grows as bytes actually arrive
+MAX_BODY_PREALLOC = 1024 * 1024
+
+# Resolved once at import rather than stat-ed on every request:
+# React build (static/dist/index.html) if built, vanilla JS (static/index.html) otherwise
+FRONTEND_INDEX = (
+    "static/dist/index.html" if Path("static/dist/index.html").exists() else "static/index.html"
+)
+
+
+class RequestBodyTooLarge(Exception):
+    """Raised when a request body exceeds the configured maximum size."""
+
+
+async def read_body_sized(request: Request, max_bytes: int) -> bytearray:
+    """
+    Read the request body into a buffer pre-sized from Content-Length.
+
+    Chunks are copied straight into place instead of being collected and
+    joined. The up-front allocation is capped at MAX_BODY_PREALLOC, and the
+    body is rejected once it is known to exceed max_bytes, either from the
+    header or from the bytes received so far.
+
+    Raises:
+        RequestBodyTooLarge: If the body is larger than max_bytes
+    """
+    length = request.headers.get("content-length", "")
+    expected = int(length) if length.isdigit() else 0
+    if expected > max_bytes:
+        raise RequestBodyTooLarge(expected)
+
+    buf = bytearray(min(expected, MAX_BODY_PREALLOC))
+    pos = 0
+    async for chunk in request.stream():
+        end = pos + len(chunk)
+        if end > max_bytes:
+            raise RequestBodyTooLarge(end)
+        if end > len(buf):
+            # Past the pre-sized part (or no length given): append instead
+            del buf[pos:]
+            buf += chunk
+        else:
+            buf[pos:end] = chunk
+        pos = end
+
+    if pos < len(buf):
+        del buf[pos:]
+    return buf
+
+
+def create_app(
+    *,
+    title: str,
+    description: str,
+    store_factory: Callable[[], Store],
+    server_factory: Callable[[Store], ChatKitServer],
+    health: Dict[str, Any],
+    branding: Dict[str, Any],
+    on_startup: Optional[Callable[[Store], Awaitable[None]]] = None,
+) -> FastAPI:
+    """
+    Create a configured ChatKit FastAPI application.
+
+    Args:
+        title: Application title (also used in startup logs)
+        description: Application description for the OpenAPI docs
+        store_factory: Builds the data store at startup
+        server_factory: Builds the ChatKit server around the store
+        health: Payload returned by /health
+        branding: Payload returned by /api/branding
+        on_startup: Optional warmup run after the store is created,
+            before the server is built
+    """
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        """Application lifespan manager - handles startup and shutdown."""
+        logger.info(f"Starting {title}...")
+
+        # Raise the thread limit so blocking SDK calls from concurrent streams don't queue
+        anyio.to_thread.current_default_thread_limiter().total_tokens = THREAD_POOL_TOKENS
+
+        # Initialize data store
+        store = store_factory()
+        app.state.store = store
+        logger.info(f"{type(store).__name__} initialized")
+
+        if on_startup is not None:
+            await on_startup(store)
+
+        # Initialize ChatKit server
+        app.state.server = server_factory(store)
+        logger.info(f"{type(app.state.server).__name__} initialized")
+
+        yield
+
+        # Cleanup
+        logger.info("Shutting down...")
+        await store.close()
+
+    app = FastAPI(
+        title=title,
+        description=description,
+        version="1.0.0",
+        lifespan=lifespan,
+        docs_url="/api/docs",
+        redoc_url="/api/redoc",
+        default_response_class=ORJSONResponse,
+    )
+    app.state.store = None
+    app.state.server = None
+
+    # CORS middleware for local development
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # Restrict in production
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    @app.post("/chatkit")
+    async def chatkit_endpoint(request: Request):
+        """
+        Main ChatKit endpoint.
+        Receives ChatKit protocol requests and returns streaming responses.
+        """
+        server = app.state.server
+        if server is None:
+            return ORJSONResponse({"error": "Server not initialized"}, status_code=500)
+
+        try:
+            body = await read_body_sized(request, settings.max_request_body_bytes)
+
+            # Process the request through ChatKit server
+            # Pass empty context - can be extended for auth/user info
+            result = await server.process(body, {})
+
+            if isinstance(result, StreamingResult):
+                return StreamingResponse(
+                    result,
+                    media_type="text/event-stream",
+                    headers=SSE_HEADERS,
+                )
+
+            return Response(content=result.json, media_type="application/json")
+
+        except RequestBodyTooLarge:
+            return ORJSONResponse(
+                {"error": f"Request body exceeds {settings.max_request_body_bytes} bytes"},
+                status_code=413,
+            )
+
+        except Exception as e:
+            logger.error(f"Error processing ChatKit request: {e}", exc_info=True)
+            # Serialize rather than format: exception text may contain quotes or newlines
+            return ORJSONResponse({"error": str(e)}, status_code=500)
+
+    # Health and branding payloads are fixed for the life of the process:
+    # serialize them once and serve the cached bytes
+    health_body = orjson.dumps(health)
+    branding_body = orjson.dumps(branding)
+
+    @app.get("/health")
+    async def health_check():
+        """Health check endpoint for container orchestration."""
+        return Response(content=health_body, media_type="application/json")
+
+    @app.get("/api/branding")
+    async def get_branding():
+        """Return branding configuration for the frontend."""
+        return Response(content=branding_body, media_type="application/json")
+
+    @app.get("/", response_class=HTMLResponse)
+    async def serve_frontend():
+        """Serve the ChatKit frontend."""
+        return FileResponse(FRONTEND_INDEX)
+
+    # Serve static files - React build takes priority.
+    # Turn off with SERVE_STATIC=false when a CDN or reverse proxy serves them.
+    if settings.serve_static:
+        try:
+            react_dist = Path("static/dist")
+            if react_dist.exists():
+                app.mount("/assets", StaticFiles(directory="static/dist/assets"), name="assets")
+                logger.info("Serving React build from static/dist")
+        except (RuntimeError, FileNotFoundError):
+            pass
+
+        try:
+            app.mount("/static", StaticFiles(directory="static"), name="static")
+        except RuntimeError:
+            logger.warning("Static files directory not found, skipping mount")
+
+    return app
@@ -3,12 +3,13 @@ Azure OpenAI Client Manager.
 Provides async Azure OpenAI client with DefaultAzureCredential for managed identity support.
 """
 
+import asyncio
 import logging
 from typing import Optional
 from openai import AsyncAzureOpenAI
 from azure.identity import DefaultAzureCredential, get_bearer_token_provider
 
-from config import settings
+from config import settings, AZURE_OPENAI_API_VERSION
 
 logger = logging.getLogger(__name__)
 
@@ -29,38 +30,44 @@ class AzureOpenAIClientManager:
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
+            cls._instance._lock = asyncio.Lock()
         return cls._instance
     
     async def get_client(self) -> AsyncAzureOpenAI:
         """Get or create the AsyncAzureOpenAI client."""
-        if self._client is None:
-            logger.info("Initializing AsyncAzureOpenAI client with DefaultAzureCredential...")
-            
-            # Create credential for Azure AD authentication
-            self._credential = DefaultAzureCredential()
-            
-            # Create token provider for automatic token refresh
-            token_provider = get_bearer_token_provider(
-                self._credential,
-                "https://cognitiveservices.azure.com/.default"
-            )
-            
-            # Normalize endpoint URL
-            azure_endpoint = settings.azure_openai_endpoint
-            if azure_endpoint.endswith("/openai/v1"):
-                azure_endpoint = azure_endpoint.replace("/openai/v1", "")
-            elif azure_endpoint.endswith("/openai/v1/"):
-                azure_endpoint = azure_endpoint.replace("/openai/v1/", "")
-            if azure_endpoint.endswith("/"):
-                azure_endpoint = azure_endpoint[:-1]
-            
-            self._client = AsyncAzureOpenAI(
-                azure_endpoint=azure_endpoint,
-                azure_ad_token_provider=token_provider,
-                api_version=settings.azure_openai_api_version,
-            )
-            
-            logger.info(f"AsyncAzureOpenAI client initialized: {azure_endpoint}")
+        if self._client is not None:
+            return self._client
+        
+        # Concurrent first requests wait here instead of each building a client
+        async with self._lock:
+            if self._client is None:
+                logger.info("Initializing AsyncAzureOpenAI client with DefaultAzureCredential...")
+                
+                # Create credential for Azure AD authentication
+                self._credential = DefaultAzureCredential()
+                
+                # Create token provider for automatic token refresh
+                token_provider = get_bearer_token_provider(
+                    self._credential,
+                    "https://cognitiveservices.azure.com/.default"
+                )
+                
+                # Normalize endpoint URL
+                azure_endpoint = settings.azure_openai_endpoint
+                if azure_endpoint.endswith("/openai/v1"):
+                    azure_endpoint = azure_endpoint.replace("/openai/v1", "")
+                elif azure_endpoint.endswith("/openai/v1/"):
+                    azure_endpoint = azure_endpoint.replace("/openai/v1/", "")
+                if azure_endpoint.endswith("/"):
+                    azure_endpoint = azure_endpoint[:-1]
+                
+                self._client = AsyncAzureOpenAI(
+                    azure_endpoint=azure_endpoint,
+                    azure_ad_token_provider=token_provider,
+                    api_version=AZURE_OPENAI_API_VERSION,
+                )
+                
+                logger.info(f"AsyncAzureOpenAI client initialized: {azure_endpoint}")
         
         return self._client
     
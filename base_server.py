@@ -15,13 +15,14 @@ To create a new use case, extend BaseChatKitServer and:
 4. Optionally override post_respond_hook() for custom widget streaming
 """
 
+import asyncio
 import logging
 from abc import abstractmethod
-from typing import Any, AsyncIterator, Optional
+from typing import Any, AsyncIterator, Optional, TypeVar
 
 from chatkit.server import ChatKitServer, ThreadStreamEvent
 from chatkit.store import Store, ThreadMetadata
-from chatkit.types import UserMessageItem, ClientToolCallItem
+from chatkit.types import UserMessageItem, UserMessageTextContent, ClientToolCallItem
 from chatkit.agents import stream_agent_response, stream_widget, AgentContext, ThreadItemConverter
 from chatkit.widgets import Card
 
@@ -29,10 +30,132 @@ from agents import Agent, Runner, RunConfig
 from agents.models.openai_responses import OpenAIResponsesModel
 
 from azure_client import client_manager
-from config import settings
+from config import AZURE_OPENAI_DEPLOYMENT
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Marks the end of a buffered stream
+_SENTINEL = object()
+
+
+class _ProducerError:
+    """Carries an exception from the buffering producer task to the consumer."""
+    
+    __slots__ = ("error",)
+    
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+async def _buffered(source: AsyncIterator[T], maxsize: int = 32) -> AsyncIterator[T]:
+    """
+    Iterate an async iterator through a bounded queue filled by a background task.
+    
+    The producer keeps pulling events from the model while the consumer is
+    serializing and flushing earlier ones to the client. The bounded queue
+    applies back-pressure so a slow client cannot make the buffer grow unbounded.
+    Exceptions raised by the source are re-raised in the consumer. If the
+    consumer stops early, the producer is cancelled and the source is closed.
+    
+    Args:
+        source: The async iterator to drain
+        maxsize: Maximum number of events buffered ahead of the consumer
+        
+    Yields:
+        The items produced by source, in order
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+    
+    async def _producer() -> None:
+        # The end-of-stream marker is only queued while the consumer is still
+        # reading. Cancellation means it has gone away, and waiting to put into
+        # a full queue nobody drains would never return.
+        try:
+            async for item in source:
+                await queue.put(item)
+        except Exception as e:
+            await queue.put(_ProducerError(e))
+        else:
+            await queue.put(_SENTINEL)
+        finally:
+            aclose = getattr(source, "aclose", None)
+            if aclose is not None:
+                await aclose()
+    
+    task = asyncio.create_task(_producer())
+    try:
+        while True:
+            item = await queue.get()
+            if item is _SENTINEL:
+                break
+            if isinstance(item, _ProducerError):
+                raise item.error
+            yield item
+    finally:
+        # Stop the producer if the consumer exits early (client disconnect, error)
+        if not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+
+def _log_stream_event(event: ThreadStreamEvent) -> None:
+    """Log a streamed event with a short preview of its content (debug only)."""
+    event_type = type(event).__name__
+    item = getattr(event, 'item', None)
+    if item is None:
+        logger.debug("Streaming event: %s", event_type)
+        return
+    
+    item_id = getattr(item, 'id', 'unknown')
+    content = getattr(item, 'content', None)
+    if not content:
+        logger.debug("Streaming event: %s, id=%s, item type: %s", event_type, item_id, type(item).__name__)
+        return
+    
+    first_content = content[0]
+    if hasattr(first_content, 'text'):
+        text_preview = first_content.text[:50] if first_content.text else ''
+        logger.debug("Streaming event: %s, id=%s, text preview: %s...", event_type, item_id, text_preview)
+    else:
+        logger.debug("Streaming event: %s, id=%s, content type: %s", event_type, item_id, type(first_content).__name__)
+
+
+def _plain_user_input(item: UserMessageItem) -> Optional[dict]:
+    """
+    Build the agent input for a user message that is plain text only.
+    
+    Produces the same message ThreadItemConverter builds for this case.
+    Returns None when the message has tags, attachments or quoted text,
+    which need the full converter.
+    """
+    if item.attachments or item.quoted_text:
+        return None
+    parts = []
+    for part in item.content:
+        if not isinstance(part, UserMessageTextContent):
+            return None
+        parts.append(part.text)
+    return {
+        "role": "user",
+        "type": "message",
+        "content": [{"type": "input_text", "text": "".join(parts)}],
+    }
+
+
+async def _logged_widget_stream(
+    thread: ThreadMetadata,
+    widget: Card,
+) -> AsyncIterator[ThreadStreamEvent]:
+    """Stream a widget, logging each event (debug only)."""
+    async for event in stream_widget(thread, widget):
+        logger.debug("Streaming widget event: %s", event.type)
+        yield event
+
 
 class BaseChatKitServer(ChatKitServer):
     """
@@ -55,6 +178,47 @@ class BaseChatKitServer(ChatKitServer):
         """
         super().__init__(data_store)
         self.data_store = data_store
+        # Stateless helpers shared by every respond() call
+        self._converter = ThreadItemConverter()
+        self._model: Optional[OpenAIResponsesModel] = None
+        self._model_lock = asyncio.Lock()
+    
+    async def _get_model(self) -> OpenAIResponsesModel:
+        """
+        Return the Azure OpenAI model wrapper, creating it on first use.
+        
+        The wrapper holds no per-thread state, so a single instance is reused
+        for every request handled by this server.
+        """
+        if self._model is None:
+            async with self._model_lock:
+                if self._model is None:
+                    client = await client_manager.get_client()
+                    # Use the Responses API for proper item IDs and better streaming support
+                    self._model = OpenAIResponsesModel(
+                        model=AZURE_OPENAI_DEPLOYMENT,
+                        openai_client=client,
+                    )
+        return self._model
+    
+    async def _to_agent_input(self, items: list) -> list:
+        """
+        Convert thread items to agent input.
+        
+        Plain-text user messages (the common case) are built directly;
+        other items go through the ThreadItemConverter. If any user message
+        needs the full converter, the whole history is converted by it.
+        """
+        agent_input = []
+        for item in items:
+            if isinstance(item, UserMessageItem):
+                message = _plain_user_input(item)
+                if message is None:
+                    return await self._converter.to_agent_input(items)
+                agent_input.append(message)
+            else:
+                agent_input.extend(await self._converter.to_agent_input(item))
+        return agent_input
     
     @abstractmethod
     def get_agent(self) -> Agent:
@@ -105,7 +269,7 @@ class BaseChatKitServer(ChatKitServer):
         
         Args:
             thread: The thread metadata
-            agent_context: The agent context (may have custom attributes set by tools)
+            agent_context: The agent context (tools queue widgets on _pending_widgets)
             
         Yields:
             Additional ThreadStreamEvent objects
@@ -124,7 +288,7 @@ class BaseChatKitServer(ChatKitServer):
         Handle user messages and generate responses using Azure OpenAI.
         
         This method:
-        1. Gets the Azure OpenAI client
+        1. Gets the Azure OpenAI model (created once per server)
         2. Creates an agent context
         3. Runs the agent with streaming
         4. Calls post_respond_hook for additional events
@@ -137,15 +301,8 @@ class BaseChatKitServer(ChatKitServer):
         Yields:
             ThreadStreamEvent objects
         """
-        # Get Azure OpenAI client
-        client = await client_manager.get_client()
-        
-        # Create the Azure OpenAI model wrapper using the Responses API
-        # This provides proper item IDs and better streaming support
-        azure_model = OpenAIResponsesModel(
-            model=settings.azure_openai_deployment,
-            openai_client=client,
-        )
+        # Get the (cached) Azure OpenAI model wrapper
+        azure_model = await self._get_model()
         
         # Create agent context with thread and store
         agent_context = AgentContext(
@@ -153,12 +310,11 @@ class BaseChatKitServer(ChatKitServer):
             store=self.data_store,
             request_context=context,
         )
+        # Widgets queued by tools during the run, consumed by post_respond_hook
+        agent_context._pending_widgets = []
         
         # Load full conversation history from the store
         # This is critical for the agent to have context of previous messages
-        converter = ThreadItemConverter()
-        
-        # Load all thread items (conversation history)
         thread_items_page = await self.data_store.load_thread_items(
             thread.id,
             after=None,
@@ -175,21 +331,21 @@ class BaseChatKitServer(ChatKitServer):
         ]
         
         # Debug: Log the conversation history being sent to the agent
-        for i, item in enumerate(relevant_items):
-            item_type = item.type
-            # Get text preview from item content
-            text_preview = ""
-            if hasattr(item, 'content') and item.content:
-                for c in item.content:
-                    if hasattr(c, 'text'):
-                        text_preview = c.text[:50] + "..." if len(c.text) > 50 else c.text
-                        break
-            logger.info(f"History[{i}]: {item_type} - {text_preview}")
+        if logger.isEnabledFor(logging.DEBUG):
+            for i, item in enumerate(relevant_items):
+                # Get text preview from item content
+                text_preview = ""
+                if hasattr(item, 'content') and item.content:
+                    for c in item.content:
+                        if hasattr(c, 'text'):
+                            text_preview = c.text[:50] + "..." if len(c.text) > 50 else c.text
+                            break
+                logger.debug("History[%d]: %s - %s", i, item.type, text_preview)
         
         # Convert the full conversation history to agent input
-        agent_input = await converter.to_agent_input(relevant_items)
+        agent_input = await self._to_agent_input(relevant_items)
         
-        logger.info(f"Agent input includes {len(relevant_items)} messages from conversation history")
+        logger.info("Agent input includes %d messages from conversation history", len(relevant_items))
         
         # Get the agent for this use case
         agent = self.get_agent()
@@ -202,33 +358,23 @@ class BaseChatKitServer(ChatKitServer):
             run_config=RunConfig(model=azure_model),
         )
         
-        # Stream the agent response back to the client
-        async for event in stream_agent_response(agent_context, result):
-            event_type = type(event).__name__
-            # Log more details about the event content
-            if hasattr(event, 'item'):
-                item = event.item
-                item_id = getattr(item, 'id', 'unknown')
-                if hasattr(item, 'content') and item.content:
-                    # Log first content item for debugging
-                    first_content = item.content[0] if item.content else None
-                    if first_content and hasattr(first_content, 'text'):
-                        text_preview = first_content.text[:50] if first_content.text else ''
-                        logger.info(f"Streaming event: {event_type}, id={item_id}, text preview: {text_preview}...")
-                    else:
-                        logger.info(f"Streaming event: {event_type}, id={item_id}, content type: {type(first_content).__name__ if first_content else 'None'}")
-                else:
-                    logger.info(f"Streaming event: {event_type}, id={item_id}, item type: {type(item).__name__}")
-            else:
-                logger.info(f"Streaming event: {event_type}")
+        # Stream the agent response back to the client.
+        # Per-event logging is debug-only: it runs once per streamed token.
+        debug = logger.isEnabledFor(logging.DEBUG)
+        async for event in _buffered(stream_agent_response(agent_context, result)):
+            if debug:
+                _log_stream_event(event)
             yield event
         
-        # Call the post-respond hook for additional events (e.g., widgets)
-        async for event in self.post_respond_hook(thread, agent_context):
-            logger.info(f"Post-respond hook event: {type(event).__name__}")
-            yield event
+        # Call the post-respond hook for additional events (e.g., widgets).
+        # Skip the extra generator entirely when the subclass keeps the no-op default.
+        if type(self).post_respond_hook is not BaseChatKitServer.post_respond_hook:
+            async for event in self.post_respond_hook(thread, agent_context):
+                if debug:
+                    logger.debug("Post-respond hook event: %s", type(event).__name__)
+                yield event
     
-    async def stream_widget_to_client(
+    def stream_widget_to_client(
         self,
         thread: ThreadMetadata,
         widget: Card,
@@ -236,13 +382,16 @@ class BaseChatKitServer(ChatKitServer):
         """
         Helper method to stream a widget to the client.
         
+        Returns ChatKit's widget stream directly unless debug logging is on,
+        so callers iterate it without an extra pass-through generator.
+        
         Args:
             thread: The thread metadata
             widget: The widget to stream
             
-        Yields:
-            Widget-related ThreadStreamEvent objects
+        Returns:
+            An async iterator of widget-related ThreadStreamEvent objects
         """
-        async for event in stream_widget(thread, widget):
-            logger.debug(f"Streaming widget event: {event.type}")
-            yield event
+        if logger.isEnabledFor(logging.DEBUG):
+            return _logged_widget_stream(thread, widget)
+        return stream_widget(thread, widget)
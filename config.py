@@ -3,7 +3,9 @@ Configuration module for ChatKit Todo App.
 Loads settings from environment variables with Azure OpenAI support.
 """
 
-import os
+import importlib.util
+import sys
+
 from pydantic_settings import BaseSettings
 from pydantic import Field
 
@@ -39,6 +41,22 @@ class Settings(BaseSettings):
         alias="APP_PORT",
         description="Port to bind the application"
     )
+    use_uvloop: bool = Field(
+        # uvloop has no Windows build
+        default=sys.platform != "win32",
+        alias="USE_UVLOOP",
+        description="Run the server on the uvloop event loop instead of the default asyncio loop"
+    )
+    max_request_body_bytes: int = Field(
+        default=10 * 1024 * 1024,
+        alias="MAX_REQUEST_BODY_BYTES",
+        description="Largest /chatkit request body accepted; bigger requests get 413"
+    )
+    serve_static: bool = Field(
+        default=True,
+        alias="SERVE_STATIC",
+        description="Serve /static and /assets from the app; set to false when a CDN or reverse proxy serves them"
+    )
     
     # Data Store Configuration
     data_store_path: str = Field(
@@ -89,3 +107,13 @@ class Settings(BaseSettings):
 
 # Global settings instance
 settings = Settings()
+
+# Values fixed for the lifetime of the process, bound once at import
+AZURE_OPENAI_DEPLOYMENT = settings.azure_openai_deployment
+AZURE_OPENAI_API_VERSION = settings.azure_openai_api_version
+DATA_STORE_PATH = settings.data_store_path
+
+# Uvicorn loop setting: uvloop when enabled and installed, asyncio's default otherwise
+EVENT_LOOP = (
+    "uvloop" if settings.use_uvloop and importlib.util.find_spec("uvloop") else "auto"
+)
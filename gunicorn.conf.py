@@ -0,0 +1,22 @@
+"""
+Gunicorn configuration for production deployments.
+
+Runs the FastAPI app under several uvicorn workers so CPU-bound work
+(pydantic validation, JSON encoding) is spread across all cores.
+Each worker runs the app's lifespan independently.
+
+Usage (gunicorn picks up this file from the working directory):
+    gunicorn main:app
+    APP_PORT=8001 gunicorn main_retail:app
+"""
+
+import multiprocessing
+import os
+
+bind = f"{os.getenv('APP_HOST', '0.0.0.0')}:{os.getenv('APP_PORT', '8000')}"
+
+# One worker per core unless overridden
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+
+# Uvicorn worker; selects uvloop and httptools automatically when installed
+worker_class = "uvicorn_worker.UvicornWorker"
@@ -3,12 +3,14 @@ SQLite-based data store for ChatKit.
 Implements the Store interface required by ChatKit server.
 """
 
-import json
 import asyncio
 import uuid
 import aiosqlite
+import orjson
+from aiosqlitepool import SQLiteConnectionPool
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
-from typing import Optional, List, Dict, Any
+from typing import AsyncIterator, Optional, List, Dict, Any, Tuple
 from pathlib import Path
 
 from chatkit.store import Store, ThreadMetadata, ThreadItem, Page, Attachment
@@ -18,6 +20,27 @@ from pydantic import TypeAdapter
 # Create a TypeAdapter for parsing thread items from JSON
 _thread_item_adapter = TypeAdapter(ThreadItem)
 
+def _now_iso() -> str:
+    """
+    Current UTC time as the ISO-8601 string stored in every *_at column.
+    
+    Always formatted to microseconds so the strings have a fixed width:
+    pagination orders by these columns as text, and isoformat() would
+    otherwise drop the fraction whenever it happens to be zero.
+    """
+    return datetime.now(timezone.utc).isoformat(timespec="microseconds")
+
+
+# Upsert a thread item, keeping its original created_at on replace
+_SAVE_ITEM_SQL = (
+    "INSERT OR REPLACE INTO items (id, thread_id, data, created_at) "
+    "VALUES (?, ?, ?, COALESCE((SELECT created_at FROM items WHERE id = ?), ?))"
+)
+
+# Prepared statements kept per connection (sqlite3 default: 128). Every query
+# text the store issues fits, so pooled connections never re-prepare one.
+_STATEMENT_CACHE_SIZE = 256
+
 
 class SQLiteStore(Store):
     """
@@ -26,72 +49,116 @@ class SQLiteStore(Store):
     For production on Azure, consider using Azure Cosmos DB.
     """
     
-    def __init__(self, db_path: str = "./data/chatkit.db"):
+    def __init__(self, db_path: str = "./data/chatkit.db", pool_size: int = 8):
         self.db_path = db_path
-        self._db: Optional[aiosqlite.Connection] = None
-        self._lock = asyncio.Lock()
+        self._pool = SQLiteConnectionPool(
+            connection_factory=self._connect,
+            pool_size=pool_size,
+        )
+        self._schema_ready = False
+        self._schema_lock = asyncio.Lock()
+    
+    async def _connect(self) -> aiosqlite.Connection:
+        """Open a connection tuned for concurrent use (pool connection factory)."""
+        db = await aiosqlite.connect(self.db_path, cached_statements=_STATEMENT_CACHE_SIZE)
+        db.row_factory = aiosqlite.Row
+        
+        # WAL lets readers on other connections proceed while a write is in progress;
+        # NORMAL sync is durable under WAL and skips an fsync per commit
+        await db.execute("PRAGMA journal_mode=WAL")
+        await db.execute("PRAGMA synchronous=NORMAL")
+        await db.execute("PRAGMA temp_store=MEMORY")
+        await db.execute("PRAGMA mmap_size=268435456")
+        # 64 MB page cache per connection; pooled connections keep it warm across requests
+        await db.execute("PRAGMA cache_size=-64000")
+        # No Python-level write lock: a writer that finds the database locked by another
+        # connection waits in SQLite's busy handler (sqlite3's 5 s timeout), which runs
+        # on this connection's worker thread rather than the event loop.
+        # foreign_keys stays off: threads and items are upserted with INSERT OR REPLACE,
+        # which would fire ON DELETE CASCADE and wipe a thread's items on every save
+        return db
     
-    async def _ensure_db(self) -> aiosqlite.Connection:
-        """Ensure database connection exists and tables are created."""
-        if self._db is None:
+    async def _ensure_schema(self) -> None:
+        """Ensure the database file and tables exist (once per store)."""
+        if self._schema_ready:
+            return
+        
+        async with self._schema_lock:
+            if self._schema_ready:
+                return
+            
             # Create directory if it doesn't exist
             Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
             
-            self._db = await aiosqlite.connect(self.db_path)
-            self._db.row_factory = aiosqlite.Row
+            async with self._pool.connection() as db:
+                # Create tables
+                await db.executescript("""
+                    CREATE TABLE IF NOT EXISTS threads (
+                        id TEXT PRIMARY KEY,
+                        title TEXT,
+                        status TEXT DEFAULT 'ready',
+                        metadata TEXT,
+                        created_at TEXT,
+                        updated_at TEXT
+                    );
+            
+                    CREATE TABLE IF NOT EXISTS items (
+                        id TEXT PRIMARY KEY,
+                        thread_id TEXT,
+                        data TEXT,
+                        created_at TEXT,
+                        FOREIGN KEY (thread_id) REFERENCES threads(id) ON DELETE CASCADE
+                    );
+            
+                    CREATE TABLE IF NOT EXISTS attachments (
+                        id TEXT PRIMARY KEY,
+                        thread_id TEXT,
+                        data TEXT,
+                        created_at TEXT,
+                        FOREIGN KEY (thread_id) REFERENCES threads(id) ON DELETE CASCADE
+                    );
+            
+                    CREATE TABLE IF NOT EXISTS todos (
+                        id TEXT PRIMARY KEY,
+                        thread_id TEXT,
+                        title TEXT,
+                        completed INTEGER DEFAULT 0,
+                        created_at TEXT,
+                        updated_at TEXT,
+                        FOREIGN KEY (thread_id) REFERENCES threads(id) ON DELETE CASCADE
+                    );
             
-            # Create tables
-            await self._db.executescript("""
-                CREATE TABLE IF NOT EXISTS threads (
-                    id TEXT PRIMARY KEY,
-                    title TEXT,
-                    status TEXT DEFAULT 'ready',
-                    metadata TEXT,
-                    created_at TEXT,
-                    updated_at TEXT
-                );
-                
-                CREATE TABLE IF NOT EXISTS items (
-                    id TEXT PRIMARY KEY,
-                    thread_id TEXT,
-                    data TEXT,
-                    created_at TEXT,
-                    FOREIGN KEY (thread_id) REFERENCES threads(id) ON DELETE CASCADE
-                );
-                
-                CREATE TABLE IF NOT EXISTS attachments (
-                    id TEXT PRIMARY KEY,
-                    thread_id TEXT,
-                    data TEXT,
-                    created_at TEXT,
-                    FOREIGN KEY (thread_id) REFERENCES threads(id) ON DELETE CASCADE
-                );
-                
-                CREATE TABLE IF NOT EXISTS todos (
-                    id TEXT PRIMARY KEY,
-                    thread_id TEXT,
-                    title TEXT,
-                    completed INTEGER DEFAULT 0,
-                    created_at TEXT,
-                    updated_at TEXT,
-                    FOREIGN KEY (thread_id) REFERENCES threads(id) ON DELETE CASCADE
-                );
-                
-                CREATE INDEX IF NOT EXISTS idx_items_thread_id ON items(thread_id);
-                CREATE INDEX IF NOT EXISTS idx_attachments_thread_id ON attachments(thread_id);
-                CREATE INDEX IF NOT EXISTS idx_todos_thread_id ON todos(thread_id);
-            """)
-            await self._db.commit()
-        
-        return self._db
+                    -- Covers the thread filter and the (created_at, id) page order,
+                    -- so history pages are an index range scan with no sort
+                    DROP INDEX IF EXISTS idx_items_thread_id;
+                    CREATE INDEX IF NOT EXISTS idx_items_thread_created ON items(thread_id, created_at, id);
+                    CREATE INDEX IF NOT EXISTS idx_threads_updated ON threads(updated_at, id);
+                    CREATE INDEX IF NOT EXISTS idx_attachments_thread_id ON attachments(thread_id);
+                    CREATE INDEX IF NOT EXISTS idx_todos_thread_id ON todos(thread_id);
+                    -- Todos are listed globally by creation time; scan this instead of sorting
+                    CREATE INDEX IF NOT EXISTS idx_todos_created ON todos(created_at);
+                """)
+                await db.commit()
+            
+            self._schema_ready = True
+    
+    @asynccontextmanager
+    async def _connection(self) -> AsyncIterator[aiosqlite.Connection]:
+        """
+        Borrow a pooled connection for the duration of the block.
+        
+        The pool rolls back any unfinished transaction when the connection
+        is released, so the next borrower always starts clean.
+        """
+        await self._ensure_schema()
+        async with self._pool.connection() as db:
+            yield db
     
     # ----- Store interface implementation -----
     
     async def load_thread(self, thread_id: str, context: Any) -> ThreadMetadata:
         """Load a thread's metadata by id."""
-        db = await self._ensure_db()
-        
-        async with db.execute(
+        async with self._connection() as db, db.execute(
             "SELECT * FROM threads WHERE id = ?", (thread_id,)
         ) as cursor:
             row = await cursor.fetchone()
@@ -110,9 +177,8 @@ class SQLiteStore(Store):
     
     async def _create_thread(self, thread_id: str, context: Any) -> ThreadMetadata:
         """Create a new thread."""
-        db = await self._ensure_db()
         now = datetime.now(timezone.utc)
-        now_iso = now.isoformat()
+        now_iso = now.isoformat(timespec="microseconds")
 
         thread = ThreadMetadata(
             id=thread_id, 
@@ -121,7 +187,7 @@ class SQLiteStore(Store):
             created_at=now
         )
         
-        async with self._lock:
+        async with self._connection() as db:
             await db.execute(
                 "INSERT OR REPLACE INTO threads (id, title, status, metadata, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
                 (thread_id, thread.title, "active", "{}", now_iso, now_iso)
@@ -132,13 +198,12 @@ class SQLiteStore(Store):
     
     async def save_thread(self, thread: ThreadMetadata, context: Any) -> None:
         """Persist thread metadata."""
-        db = await self._ensure_db()
-        now = datetime.now(timezone.utc).isoformat()
+        now = _now_iso()
         
         # Get status type string from the status object
         status_str = thread.status.type if thread.status else "active"
         
-        async with self._lock:
+        async with self._connection() as db:
             await db.execute(
                 "INSERT OR REPLACE INTO threads (id, title, status, metadata, created_at, updated_at) VALUES (?, ?, ?, ?, COALESCE((SELECT created_at FROM threads WHERE id = ?), ?), ?)",
                 (thread.id, thread.title, status_str, "{}", thread.id, now, now)
@@ -154,83 +219,104 @@ class SQLiteStore(Store):
         context: Any,
     ) -> Page[ThreadItem]:
         """Load a page of thread items with pagination."""
-        db = await self._ensure_db()
-        
         order_dir = "DESC" if order == "desc" else "ASC"
+        cmp = "<" if order == "desc" else ">"
         
         if after:
-            query = f"SELECT * FROM items WHERE thread_id = ? AND id > ? ORDER BY created_at {order_dir} LIMIT ?"
-            params = (thread_id, after, limit + 1)
+            # Keyset pagination: continue strictly past the cursor item in (created_at, id) order
+            query = (
+                "SELECT * FROM items WHERE thread_id = ? "
+                f"AND (created_at, id) {cmp} ((SELECT created_at FROM items WHERE id = ?), ?) "
+                f"ORDER BY created_at {order_dir}, id {order_dir} LIMIT ?"
+            )
+            params = (thread_id, after, after, limit + 1)
         else:
-            query = f"SELECT * FROM items WHERE thread_id = ? ORDER BY created_at {order_dir} LIMIT ?"
+            query = f"SELECT * FROM items WHERE thread_id = ? ORDER BY created_at {order_dir}, id {order_dir} LIMIT ?"
             params = (thread_id, limit + 1)
         
-        items = []
-        has_more = False
-        last_id = None
-        
-        async with db.execute(query, params) as cursor:
+        # LIMIT caps the result at limit + 1 rows, so a single fetch is one trip to the
+        # connection's thread; decode after the block so the connection goes back first
+        async with self._connection() as db, db.execute(query, params) as cursor:
             rows = await cursor.fetchall()
-            for i, row in enumerate(rows):
-                if i >= limit:
-                    has_more = True
-                    break
-                item_data = json.loads(row["data"])
-                # Parse dict back into proper ThreadItem type
-                item = _thread_item_adapter.validate_python(item_data)
-                items.append(item)
-                last_id = row["id"]
+        
+        # The extra row only signals that another page exists
+        has_more = len(rows) > limit
+        if has_more:
+            del rows[limit:]
+        
+        # Parse and validate the stored JSON in one pass
+        items = [_thread_item_adapter.validate_json(row["data"]) for row in rows]
+        last_id = rows[-1]["id"] if rows else None
         
         return Page(data=items, has_more=has_more, after=last_id if has_more else None)
     
+    async def load_widget_item_refs(
+        self, thread_id: str, widget_id_prefix: str, limit: int = 100
+    ) -> List[Tuple[str, str]]:
+        """
+        Return (item_id, created_at) for a thread's widget items whose widget id
+        starts with widget_id_prefix, oldest first.
+        
+        The filter runs on the stored JSON inside SQLite, so messages, tool
+        calls and other widgets are never sent back or validated. created_at
+        is the item's own ISO timestamp from its JSON.
+        """
+        async with self._connection() as db:
+            rows = await db.execute_fetchall(
+                "SELECT id, json_extract(data, '$.created_at') AS item_created_at FROM items "
+                "WHERE thread_id = ? AND json_extract(data, '$.type') = 'widget' "
+                "AND substr(json_extract(data, '$.widget.id'), 1, ?) = ? "
+                "ORDER BY created_at ASC, id ASC LIMIT ?",
+                (thread_id, len(widget_id_prefix), widget_id_prefix, limit)
+            )
+        return [(row["id"], row["item_created_at"]) for row in rows]
+    
     async def add_thread_item(
         self, thread_id: str, item: ThreadItem, context: Any
     ) -> None:
         """Persist a newly created thread item."""
         await self.save_item(thread_id, item, context)
     
+    @staticmethod
+    def _item_row(thread_id: str, item: ThreadItem, now: str) -> tuple:
+        """Build the parameters for _SAVE_ITEM_SQL from a thread item."""
+        # Serialize straight to JSON - pydantic-core for models, orjson for plain mappings
+        if hasattr(item, 'model_dump_json'):
+            item_id = getattr(item, 'id', None) or f"item_{uuid.uuid4().hex[:12]}"
+            data = item.model_dump_json()
+        else:
+            item_data = dict(item)
+            item_id = item_data.get('id', f"item_{uuid.uuid4().hex[:12]}")
+            data = orjson.dumps(item_data).decode()
+        return (item_id, thread_id, data, item_id, now)
+    
     async def save_item(
         self, thread_id: str, item: ThreadItem, context: Any
     ) -> None:
         """Upsert a thread item by id."""
-        db = await self._ensure_db()
-        now = datetime.now(timezone.utc).isoformat()
+        now = _now_iso()
+        row = self._item_row(thread_id, item, now)
         
-        # Serialize item to JSON - use model_dump with mode='json' for proper serialization
-        if hasattr(item, 'model_dump'):
-            item_data = item.model_dump(mode='json')
-        else:
-            item_data = dict(item)
-        item_id = item_data.get('id', f"item_{uuid.uuid4().hex[:12]}")
-        
-        async with self._lock:
-            await db.execute(
-                "INSERT OR REPLACE INTO items (id, thread_id, data, created_at) VALUES (?, ?, ?, COALESCE((SELECT created_at FROM items WHERE id = ?), ?))",
-                (item_id, thread_id, json.dumps(item_data), item_id, now)
-            )
+        async with self._connection() as db:
+            await db.execute(_SAVE_ITEM_SQL, row)
             await db.commit()
     
     async def load_item(
         self, thread_id: str, item_id: str, context: Any
     ) -> ThreadItem:
         """Load a thread item by id."""
-        db = await self._ensure_db()
-        
-        async with db.execute(
+        async with self._connection() as db, db.execute(
             "SELECT * FROM items WHERE id = ? AND thread_id = ?", (item_id, thread_id)
         ) as cursor:
             row = await cursor.fetchone()
             if row:
-                item_data = json.loads(row["data"])
-                return _thread_item_adapter.validate_python(item_data)
+                return _thread_item_adapter.validate_json(row["data"])
         
         raise KeyError(f"Item {item_id} not found in thread {thread_id}")
     
     async def delete_thread(self, thread_id: str, context: Any) -> None:
         """Delete a thread and its items."""
-        db = await self._ensure_db()
-        
-        async with self._lock:
+        async with self._connection() as db:
             await db.execute("DELETE FROM items WHERE thread_id = ?", (thread_id,))
             await db.execute("DELETE FROM attachments WHERE thread_id = ?", (thread_id,))
             await db.execute("DELETE FROM todos WHERE thread_id = ?", (thread_id,))
@@ -241,9 +327,7 @@ class SQLiteStore(Store):
         self, thread_id: str, item_id: str, context: Any
     ) -> None:
         """Delete a thread item by id."""
-        db = await self._ensure_db()
-        
-        async with self._lock:
+        async with self._connection() as db:
             await db.execute(
                 "DELETE FROM items WHERE id = ? AND thread_id = ?", (item_id, thread_id)
             )
@@ -257,51 +341,55 @@ class SQLiteStore(Store):
         context: Any,
     ) -> Page[ThreadMetadata]:
         """Load a page of threads with pagination."""
-        db = await self._ensure_db()
-        
         order_dir = "DESC" if order == "desc" else "ASC"
+        cmp = "<" if order == "desc" else ">"
         
         if after:
-            query = f"SELECT * FROM threads WHERE id > ? ORDER BY updated_at {order_dir} LIMIT ?"
-            params = (after, limit + 1)
+            # Keyset pagination: continue strictly past the cursor thread in (updated_at, id) order
+            query = (
+                "SELECT * FROM threads "
+                f"WHERE (updated_at, id) {cmp} ((SELECT updated_at FROM threads WHERE id = ?), ?) "
+                f"ORDER BY updated_at {order_dir}, id {order_dir} LIMIT ?"
+            )
+            params = (after, after, limit + 1)
         else:
-            query = f"SELECT * FROM threads ORDER BY updated_at {order_dir} LIMIT ?"
+            query = f"SELECT * FROM threads ORDER BY updated_at {order_dir}, id {order_dir} LIMIT ?"
             params = (limit + 1,)
         
+        # Same single fetch as load_thread_items; rows are converted off the connection
+        async with self._connection() as db, db.execute(query, params) as cursor:
+            rows = await cursor.fetchall()
+        
+        has_more = len(rows) > limit
+        if has_more:
+            del rows[limit:]
+        
         threads = []
-        has_more = False
-        last_id = None
+        for row in rows:
+            # Parse created_at from ISO string (use bracket notation for sqlite3.Row)
+            created_at_str = row["created_at"] if "created_at" in row.keys() else row["updated_at"]
+            if created_at_str:
+                created_at = datetime.fromisoformat(created_at_str.replace('Z', '+00:00'))
+            else:
+                created_at = datetime.now(timezone.utc)
+            
+            # Build proper ThreadStatus object
+            status_str = row["status"] if "status" in row.keys() else "active"
+            if status_str == "locked":
+                status = LockedStatus()
+            elif status_str == "closed":
+                status = ClosedStatus()
+            else:
+                status = ActiveStatus()
+            
+            threads.append(ThreadMetadata(
+                id=row["id"],
+                title=row["title"],
+                created_at=created_at,
+                status=status,
+            ))
         
-        async with db.execute(query, params) as cursor:
-            rows = await cursor.fetchall()
-            for i, row in enumerate(rows):
-                if i >= limit:
-                    has_more = True
-                    break
-                
-                # Parse created_at from ISO string (use bracket notation for sqlite3.Row)
-                created_at_str = row["created_at"] if "created_at" in row.keys() else row["updated_at"]
-                if created_at_str:
-                    created_at = datetime.fromisoformat(created_at_str.replace('Z', '+00:00'))
-                else:
-                    created_at = datetime.now(timezone.utc)
-                
-                # Build proper ThreadStatus object
-                status_str = row["status"] if "status" in row.keys() else "active"
-                if status_str == "locked":
-                    status = LockedStatus()
-                elif status_str == "closed":
-                    status = ClosedStatus()
-                else:
-                    status = ActiveStatus()
-                
-                threads.append(ThreadMetadata(
-                    id=row["id"],
-                    title=row["title"],
-                    created_at=created_at,
-                    status=status,
-                ))
-                last_id = row["id"]
+        last_id = rows[-1]["id"] if rows else None
         
         return Page(data=threads, has_more=has_more, after=last_id if has_more else None)
     
@@ -309,15 +397,14 @@ class SQLiteStore(Store):
     
     async def save_attachment(self, attachment: Attachment, context: Any) -> None:
         """Persist attachment metadata."""
-        db = await self._ensure_db()
-        now = datetime.now(timezone.utc).isoformat()
+        now = _now_iso()
         
         attachment_data = attachment.model_dump() if hasattr(attachment, 'model_dump') else dict(attachment)
         
-        async with self._lock:
+        async with self._connection() as db:
             await db.execute(
                 "INSERT OR REPLACE INTO attachments (id, thread_id, data, created_at) VALUES (?, ?, ?, ?)",
-                (attachment.id, getattr(attachment, 'thread_id', ''), json.dumps(attachment_data), now)
+                (attachment.id, getattr(attachment, 'thread_id', ''), orjson.dumps(attachment_data).decode(), now)
             )
             await db.commit()
     
@@ -325,22 +412,18 @@ class SQLiteStore(Store):
         self, attachment_id: str, context: Any
     ) -> Attachment:
         """Load attachment metadata by id."""
-        db = await self._ensure_db()
-        
-        async with db.execute(
+        async with self._connection() as db, db.execute(
             "SELECT * FROM attachments WHERE id = ?", (attachment_id,)
         ) as cursor:
             row = await cursor.fetchone()
             if row:
-                return json.loads(row["data"])
+                return orjson.loads(row["data"])
         
         raise KeyError(f"Attachment {attachment_id} not found")
     
     async def delete_attachment(self, attachment_id: str, context: Any) -> None:
         """Delete attachment metadata by id."""
-        db = await self._ensure_db()
-        
-        async with self._lock:
+        async with self._connection() as db:
             await db.execute(
                 "DELETE FROM attachments WHERE id = ?", (attachment_id,)
             )
@@ -351,18 +434,15 @@ class SQLiteStore(Store):
     # not conversation state. The thread_id parameter is kept for API compatibility
     # but is ignored for queries (only stored for reference).
     
-    async def add_todo(self, thread_id: str, title: str) -> Dict[str, Any]:
-        """Add a todo item (global, not thread-specific)."""
-        db = await self._ensure_db()
-        now = datetime.now(timezone.utc).isoformat()
+    async def _insert_todo(self, db: aiosqlite.Connection, thread_id: str, title: str) -> Dict[str, Any]:
+        """Insert a todo row without committing; the caller commits."""
+        now = _now_iso()
         todo_id = f"todo_{uuid.uuid4().hex[:12]}"
         
-        async with self._lock:
-            await db.execute(
-                "INSERT INTO todos (id, thread_id, title, completed, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
-                (todo_id, thread_id, title, 0, now, now)
-            )
-            await db.commit()
+        await db.execute(
+            "INSERT INTO todos (id, thread_id, title, completed, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (todo_id, thread_id, title, 0, now, now)
+        )
         
         return {
             "id": todo_id,
@@ -371,20 +451,24 @@ class SQLiteStore(Store):
             "created_at": now
         }
     
-    async def complete_todo(self, thread_id: str, todo_id: str) -> Optional[Dict[str, Any]]:
-        """Mark a todo as completed (global lookup by todo_id only)."""
-        db = await self._ensure_db()
-        now = datetime.now(timezone.utc).isoformat()
-        
-        async with self._lock:
-            await db.execute(
-                "UPDATE todos SET completed = 1, updated_at = ? WHERE id = ?",
-                (now, todo_id)
-            )
-            await db.commit()
-        
+    async def _complete_todo_row(
+        self, db: aiosqlite.Connection, todo_id: str, pending_only: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Mark a todo row completed without committing; the caller commits.
+        
+        With pending_only, an already-completed todo is left untouched and
+        None is returned, the same as for a missing one.
+        """
+        now = _now_iso()
+        sql = "UPDATE todos SET completed = 1, updated_at = ? WHERE id = ?"
+        if pending_only:
+            sql += " AND completed = 0"
+        
+        # RETURNING hands back the updated row, so no follow-up SELECT is needed
         async with db.execute(
-            "SELECT * FROM todos WHERE id = ?", (todo_id,)
+            sql + " RETURNING id, title, completed, updated_at",
+            (now, todo_id)
         ) as cursor:
             row = await cursor.fetchone()
             if row:
@@ -396,39 +480,113 @@ class SQLiteStore(Store):
                 }
         return None
     
+    async def _delete_todo_row(self, db: aiosqlite.Connection, todo_id: str) -> bool:
+        """Delete a todo row without committing; the caller commits."""
+        cursor = await db.execute(
+            "DELETE FROM todos WHERE id = ?", (todo_id,)
+        )
+        return cursor.rowcount > 0
+    
+    async def _select_todos(self, db: aiosqlite.Connection) -> List[Dict[str, Any]]:
+        """Read all todos on the given connection."""
+        # execute_fetchall runs the query and fetch in one trip to the
+        # connection's worker thread (a cursor costs one trip per call)
+        rows = await db.execute_fetchall(
+            "SELECT * FROM todos ORDER BY created_at ASC"
+        )
+        return [
+            {
+                "id": row["id"],
+                "title": row["title"],
+                "completed": bool(row["completed"]),
+                "created_at": row["created_at"],
+                "updated_at": row["updated_at"]
+            }
+            for row in rows
+        ]
+    
+    async def add_todo(self, thread_id: str, title: str) -> Dict[str, Any]:
+        """Add a todo item (global, not thread-specific)."""
+        async with self._connection() as db:
+            todo = await self._insert_todo(db, thread_id, title)
+            await db.commit()
+        
+        return todo
+    
+    async def complete_todo(self, thread_id: str, todo_id: str) -> Optional[Dict[str, Any]]:
+        """Mark a todo as completed (global lookup by todo_id only)."""
+        async with self._connection() as db:
+            todo = await self._complete_todo_row(db, todo_id)
+            await db.commit()
+        
+        return todo
+    
     async def delete_todo(self, thread_id: str, todo_id: str) -> bool:
         """Delete a todo item (global lookup by todo_id only)."""
-        db = await self._ensure_db()
-        
-        async with self._lock:
-            cursor = await db.execute(
-                "DELETE FROM todos WHERE id = ?", (todo_id,)
-            )
+        async with self._connection() as db:
+            deleted = await self._delete_todo_row(db, todo_id)
             await db.commit()
-            return cursor.rowcount > 0
+        
+        return deleted
     
     async def list_todos(self, thread_id: str) -> List[Dict[str, Any]]:
         """List ALL todos (global, ignores thread_id)."""
-        db = await self._ensure_db()
+        async with self._connection() as db:
+            return await self._select_todos(db)
+    
+    # Combined mutation + listing, used wherever the updated list is rendered
+    # right after a change. Each runs in a single transaction and returns
+    # (mutation result, updated todos).
+    
+    async def add_todo_and_list(
+        self, thread_id: str, title: str
+    ) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """Add a todo and return it together with the updated todo list."""
+        async with self._connection() as db:
+            todo = await self._insert_todo(db, thread_id, title)
+            todos = await self._select_todos(db)
+            await db.commit()
         
-        todos = []
-        async with db.execute(
-            "SELECT * FROM todos ORDER BY created_at ASC"
-        ) as cursor:
-            rows = await cursor.fetchall()
-            for row in rows:
-                todos.append({
-                    "id": row["id"],
-                    "title": row["title"],
-                    "completed": bool(row["completed"]),
-                    "created_at": row["created_at"],
-                    "updated_at": row["updated_at"]
-                })
+        return todo, todos
+    
+    async def complete_todo_and_list(
+        self, thread_id: str, todo_id: str
+    ) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Complete a todo and return it (or None) together with the updated todo list."""
+        async with self._connection() as db:
+            todo = await self._complete_todo_row(db, todo_id)
+            todos = await self._select_todos(db)
+            await db.commit()
+        
+        return todo, todos
+    
+    async def toggle_todo_and_list(
+        self, thread_id: str, todo_id: str
+    ) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Complete a todo if it is still pending and return it together with the updated list.
+        
+        The todo is None when it doesn't exist or was already completed
+        (nothing is written in that case).
+        """
+        async with self._connection() as db:
+            todo = await self._complete_todo_row(db, todo_id, pending_only=True)
+            todos = await self._select_todos(db)
+            await db.commit()
+        
+        return todo, todos
+    
+    async def delete_todo_and_list(
+        self, thread_id: str, todo_id: str
+    ) -> Tuple[bool, List[Dict[str, Any]]]:
+        """Delete a todo and return whether it existed together with the updated todo list."""
+        async with self._connection() as db:
+            deleted = await self._delete_todo_row(db, todo_id)
+            todos = await self._select_todos(db)
+            await db.commit()
         
-        return todos
+        return deleted, todos
     
     async def close(self):
-        """Close the database connection."""
-        if self._db:
-            await self._db.close()
-            self._db = None
+        """Close all pooled database connections."""
+        await self._pool.close()
@@ -0,0 +1,8 @@
+"""
+Pytest configuration: make the top-level modules importable from tests/.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
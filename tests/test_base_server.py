@@ -0,0 +1,77 @@
+"""
+Tests for the buffered event stream used by BaseChatKitServer.
+"""
+
+import asyncio
+
+import pytest
+
+from base_server import _buffered
+
+
+def _run(coro):
+    """Run a coroutine, failing instead of hanging if the stream deadlocks."""
+    async def main():
+        # asyncio.wait doesn't cancel on timeout, so a swallowed
+        # cancellation can't make a stuck stream look finished
+        task = asyncio.ensure_future(coro)
+        done, _ = await asyncio.wait({task}, timeout=5)
+        assert task in done, "stream did not finish"
+        return task.result()
+    
+    return asyncio.run(main())
+
+
+class _Source:
+    """Async generator wrapper that records whether it was closed."""
+    
+    def __init__(self, count: int, fail_at: int | None = None):
+        self.closed = False
+        self._count = count
+        self._fail_at = fail_at
+    
+    async def __call__(self):
+        try:
+            for i in range(self._count):
+                if i == self._fail_at:
+                    raise ValueError("boom")
+                yield i
+        finally:
+            self.closed = True
+
+
+def test_yields_all_items_in_order():
+    source = _Source(100)
+    
+    async def consume():
+        return [item async for item in _buffered(source(), maxsize=4)]
+    
+    assert _run(consume()) == list(range(100))
+    assert source.closed
+
+
+def test_reraises_source_errors():
+    source = _Source(10, fail_at=3)
+    
+    async def consume():
+        seen = []
+        with pytest.raises(ValueError, match="boom"):
+            async for item in _buffered(source(), maxsize=4):
+                seen.append(item)
+        return seen
+    
+    assert _run(consume()) == [0, 1, 2]
+
+
+def test_early_close_with_full_queue_does_not_hang():
+    source = _Source(1000)
+    
+    async def consume():
+        stream = _buffered(source(), maxsize=4)
+        assert await stream.__anext__() == 0
+        # Let the producer fill the queue and block on put()
+        await asyncio.sleep(0.05)
+        await stream.aclose()
+    
+    _run(consume())
+    assert source.closed
@@ -57,6 +57,7 @@ from use_cases.retail.sample_data import (
     get_order_by_id,
     get_product_by_id,
     enrich_order_with_products,
+    enrich_order_full,
     is_item_returnable,
     calculate_refund,
     generate_return_label,
@@ -91,6 +92,7 @@ __all__ = [
     "get_order_by_id",
     "get_product_by_id",
     "enrich_order_with_products",
+    "enrich_order_full",
     "is_item_returnable",
     "calculate_refund",
     "generate_return_label",
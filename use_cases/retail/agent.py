@@ -31,7 +31,6 @@ from .widgets import (
     create_resolution_options_widget,
     create_shipping_options_widget,
     create_retention_offer_widget,
-    create_return_summary_widget,
     create_return_confirmation_widget,
     create_error_widget,
     create_return_history_widget,
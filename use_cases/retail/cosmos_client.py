@@ -5,13 +5,19 @@ Provides data access methods for the retail order returns flow.
 Uses DefaultAzureCredential for flexible authentication.
 """
 
+import functools
 import logging
+import uuid
 from typing import Any, Dict, List, Optional
 from datetime import datetime, timedelta, timezone
 
+from azure.core.pipeline.transport import RequestsTransport
 from azure.cosmos import CosmosClient
 from azure.cosmos.exceptions import CosmosResourceNotFoundError
 from azure.identity import DefaultAzureCredential
+from requests import Session
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +42,41 @@ CONTAINERS = {
     "demo_scenarios": "Retail_DemoScenarios",
 }
 
+# Keep-alive HTTPS connections held open to the Cosmos DB gateway, per client
+COSMOS_POOL_MAXSIZE = 50
+
+
+@functools.lru_cache(maxsize=1)
+def get_cosmos_credential() -> DefaultAzureCredential:
+    """
+    Get the credential shared by every Cosmos DB client in the process.
+    
+    The retail client and the ChatKit store talk to the same account, so one
+    credential means one cached token instead of an acquisition per client.
+    """
+    return DefaultAzureCredential(
+        exclude_interactive_browser_credential=False,
+        exclude_shared_token_cache_credential=False,
+    )
+
+
+def build_cosmos_transport(pool_maxsize: int = COSMOS_POOL_MAXSIZE) -> RequestsTransport:
+    """
+    Build a requests transport with a larger connection pool.
+    
+    urllib3 keeps only 10 connections per host by default, so concurrent
+    requests would otherwise keep re-doing the TLS handshake.
+    """
+    session = Session()
+    # Cosmos DB applies its own retry policy; leave urllib3 retries off like azure-core does
+    adapter = HTTPAdapter(
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(total=False, redirect=False, raise_on_status=False),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return RequestsTransport(session=session, session_owner=True)
+
 
 class RetailCosmosClient:
     """Client for accessing retail data in Cosmos DB."""
@@ -43,11 +84,10 @@ class RetailCosmosClient:
     def __init__(self):
         """Initialize the Cosmos DB client."""
         logger.info("Initializing Retail Cosmos DB client...")
-        self._credential = DefaultAzureCredential(
-            exclude_interactive_browser_credential=False,
-            exclude_shared_token_cache_credential=False,
+        self._credential = get_cosmos_credential()
+        self._client = CosmosClient(
+            COSMOS_ENDPOINT, credential=self._credential, transport=build_cosmos_transport()
         )
-        self._client = CosmosClient(COSMOS_ENDPOINT, credential=self._credential)
         self._database = self._client.get_database_client(DATABASE_NAME)
         self._containers = {}
         logger.info("Retail Cosmos DB client initialized")
@@ -274,7 +314,6 @@ class RetailCosmosClient:
         container = self._get_container("returns")
         
         # Generate return ID
-        import uuid
         return_id = f"RET-{uuid.uuid4().hex[:8].upper()}"
         
         return_record = {
@@ -317,7 +356,6 @@ class RetailCosmosClient:
     def add_customer_note(self, customer_id: str, note_type: str, content: str) -> Dict[str, Any]:
         """Add a note to a customer's record."""
         container = self._get_container("customer_notes")
-        import uuid
         
         note = {
             "id": f"NOTE-{uuid.uuid4().hex[:8].upper()}",
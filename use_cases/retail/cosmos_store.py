@@ -4,20 +4,20 @@ Implements the Store interface required by ChatKit server.
 Uses the same Cosmos DB account as the retail data for unified storage.
 """
 
-import json
 import uuid
 import logging
 from datetime import datetime, timezone
-from typing import Optional, Any
+from typing import Any
 
-from azure.identity import DefaultAzureCredential, AzureCliCredential
-from azure.cosmos import CosmosClient, PartitionKey
+from azure.cosmos import CosmosClient
 from azure.cosmos.exceptions import CosmosResourceNotFoundError
 
 from chatkit.store import Store, ThreadMetadata, ThreadItem, Page, Attachment
 from chatkit.types import ActiveStatus
 from pydantic import TypeAdapter
 
+from .cosmos_client import build_cosmos_transport, get_cosmos_credential
+
 logger = logging.getLogger(__name__)
 
 # Create a TypeAdapter for parsing thread items from JSON
@@ -52,19 +52,20 @@ class CosmosDBStore(Store):
         self.items_container_name = items_container
         
         # Initialize Cosmos DB client with DefaultAzureCredential
-        # This supports multiple auth methods with fallback
+        # This supports multiple auth methods with fallback; the credential is
+        # shared with the retail data client, which uses the same account
         logger.info("Initializing Cosmos DB connection...")
-        self._credential = DefaultAzureCredential(
-            exclude_interactive_browser_credential=False,
-            exclude_shared_token_cache_credential=False,
+        self._credential = get_cosmos_credential()
+        self._transport = build_cosmos_transport()
+        self._client = CosmosClient(
+            endpoint, credential=self._credential, transport=self._transport
         )
-        self._client = CosmosClient(endpoint, credential=self._credential)
         self._database = self._client.get_database_client(database_name)
         logger.info(f"Connected to Cosmos DB: {database_name}")
         
-        # Container clients (will be created if needed)
-        self._threads_container = None
-        self._items_container = None
+        # Container proxies are local objects; build them once and reuse them
+        self._threads_container = self._database.get_container_client(threads_container)
+        self._items_container = self._database.get_container_client(items_container)
         self._initialized = False
     
     def _ensure_containers(self):
@@ -73,14 +74,6 @@ class CosmosDBStore(Store):
             return
         
         try:
-            # Try to get existing containers
-            self._threads_container = self._database.get_container_client(
-                self.threads_container_name
-            )
-            self._items_container = self._database.get_container_client(
-                self.items_container_name
-            )
-            
             # Verify they exist by reading their properties
             self._threads_container.read()
             self._items_container.read()
@@ -96,10 +89,19 @@ class CosmosDBStore(Store):
         
         self._initialized = True
     
+    async def warmup(self) -> None:
+        """
+        Open the connection to Cosmos DB ahead of the first request.
+        
+        Call once at startup so the token fetch and TLS handshake happen
+        during lifespan rather than on the first user's message.
+        """
+        self._ensure_containers()
+        logger.info("Cosmos DB store containers verified")
+    
     async def close(self):
         """Close the Cosmos DB connection."""
-        # Cosmos DB sync client doesn't need explicit close
-        pass
+        self._transport.close()
     
     # ----- Store interface implementation -----
     
@@ -224,12 +226,12 @@ class CosmosDBStore(Store):
             if i >= limit:
                 break
             
-            # Parse the item data
+            # Parse the item data; string payloads are parsed and validated in one pass
             item_data = row.get("data", row)
             if isinstance(item_data, str):
-                item_data = json.loads(item_data)
-            
-            item = _thread_item_adapter.validate_python(item_data)
+                item = _thread_item_adapter.validate_json(item_data)
+            else:
+                item = _thread_item_adapter.validate_python(item_data)
             items.append(item)
             last_id = row["id"]
         
@@ -290,7 +292,7 @@ class CosmosDBStore(Store):
             if results:
                 item_data = results[0].get("data", results[0])
                 if isinstance(item_data, str):
-                    item_data = json.loads(item_data)
+                    return _thread_item_adapter.validate_json(item_data)
                 return _thread_item_adapter.validate_python(item_data)
             
             raise KeyError(f"Item {item_id} not found in thread {thread_id}")
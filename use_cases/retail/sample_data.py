@@ -11,10 +11,11 @@ Data includes:
 - Return reasons and resolution options
 """
 
-from datetime import datetime, timedelta
+import functools
+from collections import defaultdict
+from datetime import date, datetime, timedelta
 from typing import List, Dict, Any
 import random
-import string
 
 # =============================================================================
 # PRODUCT CATALOG
@@ -224,9 +225,13 @@ CUSTOMERS = [
 # ORDERS
 # =============================================================================
 
-# Calculate dates relative to "today" (for realistic scenarios)
+# Calculate dates relative to "today" (for realistic scenarios).
+# Read the clock once so every sample date shares the same "today".
+_TODAY = date.today()
+
+
 def _days_ago(days: int) -> str:
-    return (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+    return (_TODAY - timedelta(days=days)).isoformat()
 
 
 ORDERS = [
@@ -609,98 +614,220 @@ CUSTOMER_NOTES = [
     },
 ]
 
+# =============================================================================
+# LOOKUP INDEXES
+# =============================================================================
+
+# Built once from the lists above so the getters below are dict probes
+# instead of linear scans
+_CUSTOMERS_BY_ID: Dict[str, Dict[str, Any]] = {}
+_ORDERS_BY_ID: Dict[str, Dict[str, Any]] = {}
+_PRODUCTS_BY_ID: Dict[str, Dict[str, Any]] = {}
+_ORDERS_BY_CUSTOMER: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+_REASONS_BY_CODE: Dict[str, Dict[str, Any]] = {}
+_RESOLUTIONS_BY_CODE: Dict[str, Dict[str, Any]] = {}
+# Case-folded once for the case-insensitive customer searches
+_CUSTOMERS_BY_EMAIL: Dict[str, Dict[str, Any]] = {}
+_CUSTOMER_NAMES: List[tuple[str, str, Dict[str, Any]]] = []
+
+
+def _rebuild_indexes() -> None:
+    """Rebuild the lookup indexes (call after mutating the sample lists)."""
+    _CUSTOMERS_BY_ID.clear()
+    _CUSTOMERS_BY_ID.update((c["id"], c) for c in CUSTOMERS)
+    _CUSTOMERS_BY_EMAIL.clear()
+    _CUSTOMERS_BY_EMAIL.update((c["email"].casefold(), c) for c in reversed(CUSTOMERS))
+    _CUSTOMER_NAMES[:] = [(c["first_name"].casefold(), c["last_name"].casefold(), c) for c in CUSTOMERS]
+    _ORDERS_BY_ID.clear()
+    _ORDERS_BY_ID.update((o["id"], o) for o in ORDERS)
+    _PRODUCTS_BY_ID.clear()
+    _PRODUCTS_BY_ID.update((p["id"], p) for p in PRODUCTS)
+    _ORDERS_BY_CUSTOMER.clear()
+    for o in ORDERS:
+        _ORDERS_BY_CUSTOMER[o["customer_id"]].append(o)
+    _REASONS_BY_CODE.clear()
+    _REASONS_BY_CODE.update((r["code"], r) for r in reversed(RETURN_REASONS))
+    _RESOLUTIONS_BY_CODE.clear()
+    _RESOLUTIONS_BY_CODE.update((r["code"], r) for r in reversed(RESOLUTION_OPTIONS))
+    # Memoized rules are derived from the same lists
+    _returnable_rule.cache_clear()
+    _refund_factors.cache_clear()
+
 # =============================================================================
 # HELPER FUNCTIONS
 # =============================================================================
 
 def get_customer_by_name(name: str) -> List[Dict[str, Any]]:
     """Search customers by first or last name (case-insensitive)."""
-    name_lower = name.lower()
+    name_folded = name.casefold()
     return [
-        c for c in CUSTOMERS
-        if name_lower in c["first_name"].lower() or name_lower in c["last_name"].lower()
+        c for first, last, c in _CUSTOMER_NAMES
+        if name_folded in first or name_folded in last
     ]
 
 
 def get_customer_by_email(email: str) -> Dict[str, Any] | None:
     """Find customer by exact email match."""
-    for c in CUSTOMERS:
-        if c["email"].lower() == email.lower():
-            return c
-    return None
+    return _CUSTOMERS_BY_EMAIL.get(email.casefold())
 
 
 def get_customer_by_id(customer_id: str) -> Dict[str, Any] | None:
     """Find customer by ID."""
-    for c in CUSTOMERS:
-        if c["id"] == customer_id:
-            return c
-    return None
+    return _CUSTOMERS_BY_ID.get(customer_id)
 
 
 def get_orders_for_customer(customer_id: str) -> List[Dict[str, Any]]:
     """Get all orders for a customer."""
-    return [o for o in ORDERS if o["customer_id"] == customer_id]
+    # Copy so callers can't mutate the index
+    return list(_ORDERS_BY_CUSTOMER.get(customer_id, ()))
 
 
 def get_order_by_id(order_id: str) -> Dict[str, Any] | None:
     """Find order by ID."""
-    for o in ORDERS:
-        if o["id"] == order_id:
-            return o
-    return None
+    return _ORDERS_BY_ID.get(order_id)
 
 
 def get_product_by_id(product_id: str) -> Dict[str, Any] | None:
     """Find product by ID."""
-    for p in PRODUCTS:
-        if p["id"] == product_id:
-            return p
-    return None
+    return _PRODUCTS_BY_ID.get(product_id)
+
+
+def _product_fields(product_id: str) -> Dict[str, Any] | None:
+    """Return the product fields copied onto enriched order items, or None if unknown."""
+    product = _PRODUCTS_BY_ID.get(product_id)
+    if not product:
+        return None
+    return {
+        "product_name": product["name"],
+        "category": product["category"],
+        "returnable": product["returnable"],
+        "return_window_days": product["return_window_days"],
+    }
 
 
 def enrich_order_with_products(order: Dict[str, Any]) -> Dict[str, Any]:
     """Add full product details to order items."""
     enriched = order.copy()
+    enriched["items"] = [
+        {**item, **(_product_fields(item["product_id"]) or {})}
+        for item in order["items"]
+    ]
+    return enriched
+
+
+@functools.lru_cache(maxsize=256)
+def _returnable_rule(product_id: str) -> tuple[bool, int, str] | None:
+    """Return (returnable, return_window_days, name) for a product, or None if unknown."""
+    product = get_product_by_id(product_id)
+    if not product:
+        return None
+    return product["returnable"], product["return_window_days"], product["name"]
+
+
+def _check_returnable(
+    rule: tuple[bool, int, str] | None,
+    delivery_date: datetime | None,
+    now: datetime,
+) -> tuple[bool, str]:
+    """Apply a product's return rule to a delivery date. Returns (is_returnable, reason)."""
+    if rule is None:
+        return False, "Product not found"
+    returnable, window_days, product_name = rule
+    
+    if not returnable:
+        return False, f"{product_name} is marked as final sale and cannot be returned"
+    
+    # Check if within return window
+    if delivery_date is None:
+        return False, "Order has not been delivered yet"
+    
+    window_end = delivery_date + timedelta(days=window_days)
+    
+    if now > window_end:
+        days_past = (now - window_end).days
+        return False, f"Return window expired {days_past} days ago (was {window_days} days from delivery)"
+    
+    days_remaining = (window_end - now).days
+    return True, f"{days_remaining} days remaining in return window"
+
+
+def _delivery_date(order: Dict[str, Any]) -> datetime | None:
+    """Parse an order's delivery date, or None if it hasn't been delivered."""
+    delivery_date_str = order.get("delivery_date")
+    return datetime.fromisoformat(delivery_date_str) if delivery_date_str else None
+
+
+def is_item_returnable(order: Dict[str, Any], product_id: str) -> tuple[bool, str]:
+    """
+    Check if an item from an order is still returnable.
+    Returns (is_returnable, reason).
+    """
+    rule = _returnable_rule(product_id)
+    # Unknown and final-sale products are rejected before the date is used
+    delivery_date = _delivery_date(order) if rule and rule[0] else None
+    return _check_returnable(rule, delivery_date, datetime.now())
+
+
+def enrich_order_full(order: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Add product details and return eligibility to order items in one pass.
+    
+    Equivalent to enrich_order_with_products() plus is_item_returnable() for
+    each item, but looks each product up once and parses the delivery date
+    and reads the clock once per order. Each item gains "eligible_for_return"
+    and "return_eligibility" (the reason text).
+    """
+    delivery_date = _delivery_date(order)
+    now = datetime.now()
+    enriched = order.copy()
     enriched["items"] = []
     for item in order["items"]:
-        product = get_product_by_id(item["product_id"])
+        product = _PRODUCTS_BY_ID.get(item["product_id"])
         enriched_item = item.copy()
+        rule = None
         if product:
             enriched_item["product_name"] = product["name"]
             enriched_item["category"] = product["category"]
             enriched_item["returnable"] = product["returnable"]
             enriched_item["return_window_days"] = product["return_window_days"]
+            rule = (product["returnable"], product["return_window_days"], product["name"])
+        eligible, reason = _check_returnable(rule, delivery_date, now)
+        enriched_item["eligible_for_return"] = eligible
+        enriched_item["return_eligibility"] = reason
         enriched["items"].append(enriched_item)
     return enriched
 
 
-def is_item_returnable(order: Dict[str, Any], product_id: str) -> tuple[bool, str]:
-    """
-    Check if an item from an order is still returnable.
-    Returns (is_returnable, reason).
-    """
-    product = get_product_by_id(product_id)
-    if not product:
-        return False, "Product not found"
-    
-    if not product["returnable"]:
-        return False, f"{product['name']} is marked as final sale and cannot be returned"
+# Membership tiers that get the restocking fee waived
+_PREMIUM_TIERS = frozenset({"Gold", "Platinum"})
+
+
+@functools.lru_cache(maxsize=256)
+def _refund_factors(
+    reason_code: str,
+    membership_tier: str,
+    resolution_code: str,
+) -> tuple[float, float, bool]:
+    """Return (restocking_pct, bonus_pct, restocking_waived) for a refund."""
+    reason = _REASONS_BY_CODE.get(reason_code)
+    resolution = _RESOLUTIONS_BY_CODE.get(resolution_code)
     
-    # Check if within return window
-    delivery_date_str = order.get("delivery_date")
-    if not delivery_date_str:
-        return False, "Order has not been delivered yet"
+    restocking_pct = 0.0
+    bonus_pct = 0.0
+    waived = False
     
-    delivery_date = datetime.strptime(delivery_date_str, "%Y-%m-%d")
-    window_end = delivery_date + timedelta(days=product["return_window_days"])
+    # Restocking fee (waived for Gold/Platinum)
+    if reason and reason["restocking_fee"] > 0:
+        if membership_tier in _PREMIUM_TIERS:
+            waived = True  # Waived for premium members
+        else:
+            restocking_pct = reason["restocking_fee"]
     
-    if datetime.now() > window_end:
-        days_past = (datetime.now() - window_end).days
-        return False, f"Return window expired {days_past} days ago (was {product['return_window_days']} days from delivery)"
+    # Store credit bonus
+    if resolution and resolution_code == "STORE_CREDIT":
+        bonus_pct = resolution.get("bonus_percentage", 0)
     
-    days_remaining = (window_end - datetime.now()).days
-    return True, f"{days_remaining} days remaining in return window"
+    return restocking_pct, bonus_pct, waived
 
 
 def calculate_refund(
@@ -712,44 +839,37 @@ def calculate_refund(
     """
     Calculate refund amount based on reason, membership, and resolution.
     """
-    reason = next((r for r in RETURN_REASONS if r["code"] == reason_code), None)
-    resolution = next((r for r in RESOLUTION_OPTIONS if r["code"] == resolution_code), None)
+    restocking_pct, bonus_pct, waived = _refund_factors(reason_code, membership_tier, resolution_code)
     
-    restocking_fee = 0.0
-    bonus = 0.0
-    
-    # Calculate restocking fee (waived for Gold/Platinum)
-    if reason and reason["restocking_fee"] > 0:
-        if membership_tier in ["Gold", "Platinum"]:
-            restocking_fee = 0.0  # Waived for premium members
-        else:
-            restocking_fee = item_subtotal * reason["restocking_fee"]
-    
-    # Calculate store credit bonus
-    if resolution and resolution_code == "STORE_CREDIT":
-        bonus = item_subtotal * resolution.get("bonus_percentage", 0)
+    restocking_fee = item_subtotal * restocking_pct if restocking_pct else 0.0
+    bonus = item_subtotal * bonus_pct if bonus_pct else 0.0
     
     refund_amount = item_subtotal - restocking_fee + bonus
     
     return {
         "item_subtotal": item_subtotal,
         "restocking_fee": restocking_fee,
-        "restocking_waived": membership_tier in ["Gold", "Platinum"] and reason and reason["restocking_fee"] > 0,
+        "restocking_waived": waived,
         "store_credit_bonus": bonus,
         "refund_amount": round(refund_amount, 2),
         "resolution": resolution_code,
     }
 
 
+_TRACKING_DIGITS = 22
+_LABEL_VALID_FOR = timedelta(days=14)
+
+
 def generate_return_label() -> Dict[str, str]:
     """Generate a mock return shipping label."""
-    tracking = ''.join(random.choices(string.digits, k=22))
+    # One random draw formatted as zero-padded digits
+    tracking = f"{random.randrange(10 ** _TRACKING_DIGITS):0{_TRACKING_DIGITS}d}"
     return {
         "tracking_number": f"1Z999AA1{tracking[:10]}",
         "carrier": "UPS",
         "label_url": f"/labels/{tracking}.pdf",
         "qr_code_url": f"/labels/{tracking}-qr.png",
-        "expires": (datetime.now() + timedelta(days=14)).strftime("%Y-%m-%d"),
+        "expires": (datetime.now() + _LABEL_VALID_FOR).strftime("%Y-%m-%d"),
     }
 
 
@@ -807,6 +927,9 @@ DEMO_SCENARIOS = [
 ]
 
 
+_rebuild_indexes()
+
+
 if __name__ == "__main__":
     # Quick test of the data
     print("=== Sample Data Summary ===")
@@ -823,8 +946,7 @@ if __name__ == "__main__":
         orders = get_orders_for_customer(jane["id"])
         for order in orders:
             print(f"    Order {order['id']}: {order['status']} - ${order['total']:.2f}")
-            enriched = enrich_order_with_products(order)
+            enriched = enrich_order_full(order)
             for item in enriched["items"]:
-                returnable, reason = is_item_returnable(order, item["product_id"])
-                status = "✓" if returnable else "✗"
-                print(f"      {status} {item.get('product_name', item['product_id'])}: {reason}")
+                status = "✓" if item["eligible_for_return"] else "✗"
+                print(f"      {status} {item.get('product_name', item['product_id'])}: {item['return_eligibility']}")
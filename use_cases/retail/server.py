@@ -5,18 +5,18 @@ This is the ChatKit server for the retail order returns use case.
 It extends BaseChatKitServer and integrates all retail-specific components.
 """
 
-import json
 import logging
-from typing import Any, AsyncIterator, Optional
+import sys
+from typing import Any, AsyncIterator, Final
 from datetime import datetime, timezone
 
 from chatkit.server import ThreadStreamEvent
 from chatkit.store import ThreadMetadata, Page
 from chatkit.agents import stream_widget, AgentContext
 from chatkit.types import (
-    ThreadItemUpdatedEvent, ThreadItemReplacedEvent, ThreadItemAddedEvent,
+    ThreadItemReplacedEvent,
     ThreadItemDoneEvent, InferenceOptions,
-    WidgetItem, WidgetRootUpdated,
+    WidgetItem,
     AssistantMessageItem, AssistantMessageContent,
     UserMessageItem, UserMessageTextContent,
 )
@@ -53,7 +53,8 @@ logger = logging.getLogger(__name__)
 # SYSTEM PROMPT
 # =============================================================================
 
-RETAIL_SYSTEM_PROMPT = """You are a helpful customer service assistant for a retail company, specializing in order returns.
+# Interned so every agent and request shares the one string object
+RETAIL_SYSTEM_PROMPT: Final[str] = sys.intern("""You are a helpful customer service assistant for a retail company, specializing in order returns.
 
 Your role is to:
 1. Greet customers warmly and ask how you can help
@@ -91,7 +92,7 @@ SAMPLE CUSTOMERS FOR TESTING:
 - Alice Brown - Standard member
 - Charlie Davis - Platinum member
 - Eve Wilson - Standard member
-"""
+""")
 
 
 # =============================================================================
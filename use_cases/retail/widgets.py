@@ -10,7 +10,7 @@ Generates rich UI components for the returns flow including:
 - Return confirmation
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List
 
 
 def create_customer_card(customer: Dict[str, Any]) -> Dict[str, Any]:
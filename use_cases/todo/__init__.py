@@ -22,10 +22,12 @@ Usage:
 """
 
 from use_cases.todo.server import TodoChatKitServer
-from use_cases.todo.agent import create_todo_agent, TodoContext
-from use_cases.todo.widgets import build_todo_widget
+from use_cases.todo.agent import create_todo_agent, TodoContext, PendingWidget
+from use_cases.todo.widgets import build_todo_widget, build_todo_row
 from use_cases.todo.actions import handle_todo_action
-from use_cases.todo.database import get_all_todos, add_todo, complete_todo, delete_todo
+from use_cases.todo.database import (
+    get_all_todos, add_todo, complete_todo, delete_todo, add_todos_bulk, delete_todos_bulk,
+)
 
 __all__ = [
     # Primary export - the complete ChatKit server
@@ -34,12 +36,16 @@ __all__ = [
     # Individual components for customization
     "create_todo_agent",
     "build_todo_widget", 
+    "build_todo_row",
     "handle_todo_action",
     "TodoContext",
+    "PendingWidget",
     
     # Legacy database functions (use store.py instead)
     "get_all_todos",
     "add_todo",
     "complete_todo",
     "delete_todo",
+    "add_todos_bulk",
+    "delete_todos_bulk",
 ]
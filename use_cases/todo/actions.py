@@ -4,7 +4,7 @@ Todo Action Handler.
 This module handles all interactive actions from the todo widget.
 """
 
-from typing import Any
+from typing import Any, Callable, Dict
 from .database import add_todo, complete_todo, delete_todo
 
 
@@ -18,19 +18,10 @@ def handle_todo_action(action: Any) -> dict:
     Returns:
         A response dict with success status and optional message
     """
-    action_type = action.type
-    payload = action.payload or {}
-    
-    if action_type == "add_todo_form":
-        return _handle_add(payload)
-    elif action_type == "complete_todo":
-        return _handle_complete(payload)
-    elif action_type == "toggle_todo":
-        return _handle_toggle(payload)
-    elif action_type == "delete_todo":
-        return _handle_delete(payload)
-    else:
-        return {"success": False, "message": f"Unknown action: {action_type}"}
+    handler = _ACTION_HANDLERS.get(action.type)
+    if handler is None:
+        return {"success": False, "message": f"Unknown action: {action.type}"}
+    return handler(action.payload or {})
 
 
 def _handle_add(payload: dict) -> dict:
@@ -45,26 +36,12 @@ def _handle_add(payload: dict) -> dict:
 
 
 def _handle_complete(payload: dict) -> dict:
-    """Handle complete todo button click."""
-    todo_id = payload.get("todo_id")
-    
-    if not todo_id:
-        return {"success": False, "message": "Todo ID is required"}
-    
-    todo = complete_todo(todo_id)
-    if todo:
-        return {"success": True, "todo": todo}
-    return {"success": False, "message": "Todo not found"}
-
-
-def _handle_toggle(payload: dict) -> dict:
-    """Handle checkbox toggle."""
+    """Handle complete todo button click or checkbox toggle (both toggle state)."""
     todo_id = payload.get("todo_id")
     
     if not todo_id:
         return {"success": False, "message": "Todo ID is required"}
     
-    # Toggle is essentially the same as complete (toggles state)
     todo = complete_todo(todo_id)
     if todo:
         return {"success": True, "todo": todo}
@@ -82,3 +59,12 @@ def _handle_delete(payload: dict) -> dict:
     if success:
         return {"success": True, "deleted_id": todo_id}
     return {"success": False, "message": "Todo not found"}
+
+
+# Action type -> handler; toggle_todo shares the complete handler
+_ACTION_HANDLERS: Dict[str, Callable[[dict], dict]] = {
+    "add_todo_form": _handle_add,
+    "complete_todo": _handle_complete,
+    "toggle_todo": _handle_complete,
+    "delete_todo": _handle_delete,
+}
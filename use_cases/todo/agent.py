@@ -5,8 +5,11 @@ This module defines the AI agent for todo list management.
 The agent uses OpenAI Agents SDK with function tools.
 """
 
+import functools
 import logging
-from typing import Any
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, Final, List
 
 from agents import Agent, function_tool
 from agents.run_context import RunContextWrapper
@@ -18,6 +21,17 @@ logger = logging.getLogger(__name__)
 TodoContext = AgentContext[Any]
 
 
+@dataclass
+class PendingWidget:
+    """A todo list snapshot queued by a tool, rendered after the agent responds."""
+    todos: List[Dict[str, Any]]
+
+
+def _queue_widget(ctx: RunContextWrapper["TodoContext"], todos: List[Dict[str, Any]]) -> None:
+    """Queue the todo widget for display once the response is complete."""
+    ctx.context._pending_widgets.append(PendingWidget(todos=todos))
+
+
 # ----- Tool Definitions -----
 
 @function_tool(description_override="Add a new item to the user's todo list and show the updated widget.")
@@ -25,12 +39,10 @@ async def add_todo(ctx: RunContextWrapper["TodoContext"], item: str) -> str:
     """Add a todo item to the list."""
     thread_id = ctx.context.thread.id
     store = ctx.context.store
-    result = await store.add_todo(thread_id, item)
+    result, todos = await store.add_todo_and_list(thread_id, item)
     
     # Trigger widget display after adding
-    todos = await store.list_todos(thread_id)
-    ctx.context._show_todo_widget = True
-    ctx.context._todos = todos
+    _queue_widget(ctx, todos)
     
     return f"Added '{item}' to your todo list! Here's your updated list:"
 
@@ -40,12 +52,10 @@ async def complete_todo(ctx: RunContextWrapper["TodoContext"], todo_id: str) ->
     """Mark a todo item as completed."""
     thread_id = ctx.context.thread.id
     store = ctx.context.store
-    result = await store.complete_todo(thread_id, todo_id)
+    result, todos = await store.complete_todo_and_list(thread_id, todo_id)
     
     # Trigger widget display after completing
-    todos = await store.list_todos(thread_id)
-    ctx.context._show_todo_widget = True
-    ctx.context._todos = todos
+    _queue_widget(ctx, todos)
     
     if result:
         return f"Completed '{result['title']}'! Here's your updated list:"
@@ -57,12 +67,10 @@ async def delete_todo(ctx: RunContextWrapper["TodoContext"], todo_id: str) -> st
     """Delete a todo item from the list."""
     thread_id = ctx.context.thread.id
     store = ctx.context.store
-    success = await store.delete_todo(thread_id, todo_id)
+    success, todos = await store.delete_todo_and_list(thread_id, todo_id)
     
     # Trigger widget display after deleting
-    todos = await store.list_todos(thread_id)
-    ctx.context._show_todo_widget = True
-    ctx.context._todos = todos
+    _queue_widget(ctx, todos)
     
     if success:
         return f"Deleted the todo! Here's your updated list:"
@@ -82,25 +90,21 @@ async def find_and_delete_todo(ctx: RunContextWrapper["TodoContext"], search_tex
     
     if not matches:
         # Trigger widget display to help user find the right todo
-        ctx.context._show_todo_widget = True
-        ctx.context._todos = todos
+        _queue_widget(ctx, todos)
         return f"No todo found matching '{search_text}'. Here's your todo list - you can use the delete button next to any item."
     
     if len(matches) == 1:
         # Exactly one match - delete it
         todo = matches[0]
-        await store.delete_todo(thread_id, todo["id"])
+        _, updated_todos = await store.delete_todo_and_list(thread_id, todo["id"])
         
         # Trigger widget display after deleting
-        updated_todos = await store.list_todos(thread_id)
-        ctx.context._show_todo_widget = True
-        ctx.context._todos = updated_todos
+        _queue_widget(ctx, updated_todos)
         
         return f"Deleted '{todo['title']}'! Here's your updated list:"
     
     # Multiple matches - show them to user
-    ctx.context._show_todo_widget = True
-    ctx.context._todos = todos
+    _queue_widget(ctx, todos)
     match_titles = ", ".join([f"'{m['title']}'" for m in matches])
     return f"Found multiple todos matching '{search_text}': {match_titles}. Please be more specific or use the delete button in the widget."
 
@@ -112,22 +116,23 @@ async def list_todos(ctx: RunContextWrapper["TodoContext"]) -> str:
     store = ctx.context.store
     todos = await store.list_todos(thread_id)
     
-    # Mark that we should show widget after response
-    ctx.context._show_todo_widget = True
-    ctx.context._todos = todos
-    logger.info(f"list_todos: Set _show_todo_widget=True on context (id={id(ctx.context)}), todos={len(todos)}")
+    # Queue the widget to show after the response
+    _queue_widget(ctx, todos)
+    # %-style so the message is only formatted when INFO is enabled
+    logger.info("list_todos: Queued todo widget on context (id=%s), todos=%d", id(ctx.context), len(todos))
     
     if not todos:
         return "Your todo list is empty. I'll show you a form to add new items!"
     
-    pending = sum(1 for t in todos if not t["completed"])
-    completed = sum(1 for t in todos if t["completed"])
+    completed = sum(t["completed"] for t in todos)
+    pending = len(todos) - completed
     return f"You have {len(todos)} todos ({completed} completed, {pending} pending). Here's your interactive todo list!"
 
 
 # ----- Agent Definition -----
 
-TODO_AGENT_INSTRUCTIONS = """You are a helpful todo list assistant. You help users manage their tasks and stay organized.
+# Interned so every agent and request shares the one string object
+TODO_AGENT_INSTRUCTIONS: Final[str] = sys.intern("""You are a helpful todo list assistant. You help users manage their tasks and stay organized.
 
 CRITICAL RULES - YOU MUST FOLLOW THESE:
 
@@ -162,13 +167,17 @@ TRIGGER WORDS that REQUIRE calling find_and_delete_todo:
 - "remove the one about" + description
 - "delete" + description (when no ID is given)
 
-After you call a tool, an interactive widget will automatically appear. Keep your text response VERY brief (1 line) since the widget shows all details."""
+After you call a tool, an interactive widget will automatically appear. Keep your text response VERY brief (1 line) since the widget shows all details.""")
 
 
+@functools.lru_cache(maxsize=1)
 def create_todo_agent() -> Agent["TodoContext"]:
     """
     Create and return the todo assistant agent.
     
+    The agent holds no per-request state, so it is built once per process
+    and the same instance is returned on every call.
+    
     Returns:
         An Agent configured for todo list management
     """
@@ -4,34 +4,71 @@ Todo Database Operations.
 Simple in-memory database with SQLite persistence for todo items.
 """
 
+import atexit
+import secrets
 import sqlite3
-import uuid
+import threading
+import time
 from pathlib import Path
 
 # Database file path
 DB_PATH = Path(__file__).parent.parent.parent / "todos.db"
 
-
-def _get_connection():
-    """Get a database connection."""
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
-    return conn
+# One connection shared by every call, opened on first use; sqlite3
+# connections aren't safe for concurrent use, so all access holds _LOCK.
+# Writes use `with conn:`, which commits on success and rolls back on error.
+_CONN: sqlite3.Connection | None = None
+_LOCK = threading.Lock()
+
+# Last issued ID stamp (milliseconds << 16 | sequence), guarded by _LOCK
+_last_id_stamp = 0
+# Random per-process tag, so two workers issuing the same stamp still differ
+_ID_PROCESS_TAG = secrets.token_hex(2)
+
+
+def _get_connection() -> sqlite3.Connection:
+    """Get the shared database connection (call with _LOCK held)."""
+    global _CONN
+    if _CONN is None:
+        conn = sqlite3.connect(str(DB_PATH), check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        # WAL lets readers run alongside a writer; the mode is stored in the
+        # database file, so other processes pick it up too
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")  # No fsync per commit under WAL
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA busy_timeout=5000")  # Wait for a writer instead of "database is locked"
+        atexit.register(conn.close)
+        _CONN = conn
+    return _CONN
+
+
+def _new_todo_id() -> str:
+    """
+    Generate a time-ordered todo ID (call with _LOCK held).
+    
+    Millisecond timestamp (11 hex digits) and a 16-bit sequence that counts
+    up within the millisecond (4 hex digits), followed by the process tag.
+    IDs from one process strictly increase, even for a bulk insert that
+    lands in a single millisecond, so new rows go at the right edge of the
+    primary-key B-tree instead of at random pages.
+    """
+    global _last_id_stamp
+    # Past 65536 IDs in one millisecond the stamp simply runs ahead of the clock
+    _last_id_stamp = max((time.time_ns() // 1_000_000) << 16, _last_id_stamp + 1)
+    return f"{_last_id_stamp:015x}{_ID_PROCESS_TAG}"
 
 
 def init_database():
     """Initialize the database with the todos table."""
-    conn = _get_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS todos (
-            id TEXT PRIMARY KEY,
-            title TEXT NOT NULL,
-            completed BOOLEAN NOT NULL DEFAULT 0
-        )
-    """)
-    conn.commit()
-    conn.close()
+    with _LOCK, _get_connection() as conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS todos (
+                id TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                completed BOOLEAN NOT NULL DEFAULT 0
+            )
+        """)
 
 
 def get_all_todos() -> list:
@@ -41,11 +78,10 @@ def get_all_todos() -> list:
     Returns:
         List of todo dictionaries with id, title, completed fields
     """
-    conn = _get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT id, title, completed FROM todos ORDER BY id")
-    rows = cursor.fetchall()
-    conn.close()
+    with _LOCK:
+        cursor = _get_connection().cursor()
+        cursor.execute("SELECT id, title, completed FROM todos ORDER BY id")
+        rows = cursor.fetchall()
     
     return [
         {"id": row["id"], "title": row["title"], "completed": bool(row["completed"])}
@@ -63,16 +99,12 @@ def add_todo(title: str) -> dict:
     Returns:
         The created todo dictionary
     """
-    todo_id = str(uuid.uuid4())[:8]
-    
-    conn = _get_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        "INSERT INTO todos (id, title, completed) VALUES (?, ?, ?)",
-        (todo_id, title, False)
-    )
-    conn.commit()
-    conn.close()
+    with _LOCK, _get_connection() as conn:
+        todo_id = _new_todo_id()
+        conn.execute(
+            "INSERT INTO todos (id, title, completed) VALUES (?, ?, ?)",
+            (todo_id, title, False)
+        )
     
     return {"id": todo_id, "title": title, "completed": False}
 
@@ -87,26 +119,16 @@ def complete_todo(todo_id: str) -> dict | None:
     Returns:
         The updated todo dictionary, or None if not found
     """
-    conn = _get_connection()
-    cursor = conn.cursor()
-    
-    # First get current state
-    cursor.execute("SELECT id, title, completed FROM todos WHERE id = ?", (todo_id,))
-    row = cursor.fetchone()
+    with _LOCK, _get_connection() as conn:
+        # Flip the flag and read the row back in one statement
+        row = conn.execute(
+            "UPDATE todos SET completed = NOT completed WHERE id = ? RETURNING id, title, completed",
+            (todo_id,)
+        ).fetchone()
     
     if not row:
-        conn.close()
         return None
-    
-    new_completed = not bool(row["completed"])
-    cursor.execute(
-        "UPDATE todos SET completed = ? WHERE id = ?",
-        (new_completed, todo_id)
-    )
-    conn.commit()
-    conn.close()
-    
-    return {"id": todo_id, "title": row["title"], "completed": new_completed}
+    return {"id": row["id"], "title": row["title"], "completed": bool(row["completed"])}
 
 
 def delete_todo(todo_id: str) -> bool:
@@ -119,15 +141,52 @@ def delete_todo(todo_id: str) -> bool:
     Returns:
         True if deleted, False if not found
     """
-    conn = _get_connection()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM todos WHERE id = ?", (todo_id,))
-    deleted = cursor.rowcount > 0
-    conn.commit()
-    conn.close()
+    with _LOCK, _get_connection() as conn:
+        deleted = conn.execute("DELETE FROM todos WHERE id = ?", (todo_id,)).rowcount > 0
     
     return deleted
 
 
+def add_todos_bulk(titles: list[str]) -> list[dict]:
+    """
+    Add several todo items in one transaction.
+    
+    Args:
+        titles: The todo item titles
+        
+    Returns:
+        The created todo dictionaries, in the order given
+    """
+    # One transaction for the whole batch
+    with _LOCK, _get_connection() as conn:
+        rows = [(_new_todo_id(), title, False) for title in titles]
+        conn.executemany(
+            "INSERT INTO todos (id, title, completed) VALUES (?, ?, ?)",
+            rows
+        )
+    
+    return [{"id": todo_id, "title": title, "completed": False} for todo_id, title, _ in rows]
+
+
+def delete_todos_bulk(todo_ids: list[str]) -> int:
+    """
+    Delete several todo items in one transaction.
+    
+    Args:
+        todo_ids: The IDs of the todos to delete
+        
+    Returns:
+        The number of todos deleted
+    """
+    # One transaction for the whole batch
+    with _LOCK, _get_connection() as conn:
+        cursor = conn.executemany(
+            "DELETE FROM todos WHERE id = ?",
+            [(todo_id,) for todo_id in todo_ids]
+        )
+    
+    return cursor.rowcount
+
+
 # Initialize database on module load
 init_database()
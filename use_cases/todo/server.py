@@ -11,14 +11,13 @@ Location: use_cases/todo/server.py
 
 import logging
 from typing import Any, AsyncIterator
-from datetime import datetime, timezone
 
 from chatkit.server import ThreadStreamEvent
-from chatkit.store import ThreadMetadata, Page
+from chatkit.store import ThreadMetadata
 from chatkit.agents import stream_widget
 from chatkit.types import (
     ThreadItemUpdatedEvent, ThreadItemReplacedEvent, 
-    WidgetItem, WidgetRootUpdated,
+    WidgetRootUpdated, WidgetComponentUpdated,
     AssistantMessageItem, AssistantMessageContent
 )
 
@@ -28,7 +27,7 @@ from base_server import BaseChatKitServer
 from store import SQLiteStore
 
 from .agent import create_todo_agent
-from .widgets import build_todo_widget
+from .widgets import build_todo_widget, build_todo_row_updates
 
 logger = logging.getLogger(__name__)
 
@@ -57,13 +56,10 @@ class TodoChatKitServer(BaseChatKitServer):
             data_store: SQLite store for thread and todo persistence
         """
         super().__init__(data_store)
-        self._agent = None
     
     def get_agent(self) -> Agent:
-        """Return the todo assistant agent."""
-        if self._agent is None:
-            self._agent = create_todo_agent()
-        return self._agent
+        """Return the todo assistant agent (a process-wide singleton)."""
+        return create_todo_agent()
     
     async def _collapse_old_widgets(
         self,
@@ -75,31 +71,24 @@ class TodoChatKitServer(BaseChatKitServer):
         This keeps the conversation clean with only one live widget.
         """
         try:
-            # Load all items in the thread using the correct method signature
-            items_page: Page = await self.data_store.load_thread_items(
-                thread_id=thread.id,
-                after=None,
-                limit=100,
-                order="asc",
-                context=context
+            # Only the ids of live todo widgets are needed; the store filters
+            # them in SQL instead of returning and validating every thread item
+            widget_refs = await self.data_store.load_widget_item_refs(
+                thread.id, "todo_widget_", limit=100
             )
             
-            for item in items_page.data:
-                # Check if it's a widget item (todo widget)
-                if isinstance(item, WidgetItem):
-                    widget_id = getattr(item.widget, 'id', '') if item.widget else ''
-                    if widget_id.startswith('todo_widget_'):
-                        # Create a text summary to replace the old widget
-                        summary = AssistantMessageItem(
-                            id=item.id,
-                            thread_id=thread.id,
-                            created_at=item.created_at,
-                            content=[AssistantMessageContent(
-                                text="📋 _Previous todo list snapshot_"
-                            )],
-                        )
-                        logger.info(f"Collapsing old widget {item.id} into summary")
-                        yield ThreadItemReplacedEvent(item=summary)
+            for item_id, created_at in widget_refs:
+                # Create a text summary to replace the old widget
+                summary = AssistantMessageItem(
+                    id=item_id,
+                    thread_id=thread.id,
+                    created_at=created_at,
+                    content=[AssistantMessageContent(
+                        text="📋 _Previous todo list snapshot_"
+                    )],
+                )
+                logger.info(f"Collapsing old widget {item_id} into summary")
+                yield ThreadItemReplacedEvent(item=summary)
         except Exception as e:
             logger.warning(f"Error collapsing old widgets: {e}")
     
@@ -111,39 +100,35 @@ class TodoChatKitServer(BaseChatKitServer):
         """
         Stream todo widget if agent tools triggered a display.
         
-        The todo agent tools set _show_todo_widget=True on the context
+        The todo agent tools queue a PendingWidget on the context
         when they want to display the updated todo list.
         
         Before showing a new widget, collapses old widgets into summaries.
         """
-        show_widget = getattr(agent_context, '_show_todo_widget', False)
-        todos_from_context = getattr(agent_context, '_todos', None)
+        pending = agent_context._pending_widgets
         
-        logger.info(f"post_respond_hook: thread={thread.id}, show_widget={show_widget}")
+        logger.info(f"post_respond_hook: thread={thread.id}, pending_widgets={len(pending)}")
         
-        if show_widget and todos_from_context is not None:
-            # Collapse old widgets before showing new one
-            async for event in self._collapse_old_widgets(thread, {}):
-                yield event
-            
-            # Use the todos already fetched by the tool
-            widget = build_todo_widget(todos_from_context, thread.id)
-            logger.info(f"Streaming todo widget with {len(todos_from_context)} items (from tool)")
-            async for event in stream_widget(thread, widget):
-                yield event
+        if pending:
+            # Each snapshot supersedes the previous one; only the latest is shown
+            todos = pending[-1].todos
+            source = "from tool"
         else:
             # Fallback: Always fetch and show todos after any response
             todos = await self.data_store.list_todos(thread.id)
             logger.info(f"Fallback: Fetching todos directly, found {len(todos)} items")
-            if todos or show_widget:
-                # Collapse old widgets before showing new one
-                async for event in self._collapse_old_widgets(thread, {}):
-                    yield event
-                
-                widget = build_todo_widget(todos, thread.id)
-                logger.info(f"Streaming todo widget with {len(todos)} items (fallback)")
-                async for event in stream_widget(thread, widget):
-                    yield event
+            if not todos:
+                return
+            source = "fallback"
+        
+        # Collapse old widgets before showing new one
+        async for event in self._collapse_old_widgets(thread, {}):
+            yield event
+        
+        widget = build_todo_widget(todos, thread.id)
+        logger.info(f"Streaming todo widget with {len(todos)} items ({source})")
+        async for event in stream_widget(thread, widget):
+            yield event
     
     async def action(
         self,
@@ -165,38 +150,60 @@ class TodoChatKitServer(BaseChatKitServer):
         payload = action.payload or {}
         logger.info(f"Action received: {action_type} with payload: {payload}")
         
+        # Each mutation returns the updated list from the same transaction;
+        # todos stays None when nothing was changed
+        todos = None
+        # Set when a single todo was completed, so only its row can be patched
+        completed_todo = None
+        
         if action_type == "add_todo_form":
             todo_text = payload.get("todo_text", "").strip() if isinstance(payload, dict) else ""
             logger.info(f"Adding todo: '{todo_text}' to thread {thread.id}")
             if todo_text:
-                await self.data_store.add_todo(thread.id, todo_text)
+                _, todos = await self.data_store.add_todo_and_list(thread.id, todo_text)
             
         elif action_type == "complete_todo":
             todo_id = payload.get("todo_id") if isinstance(payload, dict) else None
             if todo_id:
-                await self.data_store.complete_todo(thread.id, todo_id)
+                completed_todo, todos = await self.data_store.complete_todo_and_list(thread.id, todo_id)
         
         elif action_type == "delete_todo":
             todo_id = payload.get("todo_id") if isinstance(payload, dict) else None
             if todo_id:
-                await self.data_store.delete_todo(thread.id, todo_id)
+                _, todos = await self.data_store.delete_todo_and_list(thread.id, todo_id)
         
         elif action_type == "toggle_todo":
             todo_id = payload.get("todo_id") if isinstance(payload, dict) else None
             if todo_id:
-                # Toggle = complete if not already completed
-                todos = await self.data_store.list_todos(thread.id)
-                todo = next((t for t in todos if t["id"] == todo_id), None)
-                if todo and not todo["completed"]:
-                    await self.data_store.complete_todo(thread.id, todo_id)
+                # Toggle = complete if not already completed, checked in the same UPDATE
+                completed_todo, todos = await self.data_store.toggle_todo_and_list(thread.id, todo_id)
+        
+        has_sender = sender is not None and hasattr(sender, 'id')
+        
+        # A completed todo only changes its own row and the count badges:
+        # patch those components instead of re-rendering the whole card
+        if completed_todo is not None and has_sender:
+            updates = build_todo_row_updates(completed_todo, todos, getattr(sender, "widget", None))
+            if updates is not None:
+                logger.info(f"Patching widget row for todo {completed_todo['id']}")
+                for component in updates:
+                    yield ThreadItemUpdatedEvent(
+                        item_id=sender.id,
+                        update=WidgetComponentUpdated(
+                            component_id=component.id,
+                            component=component,
+                        ),
+                    )
+                return
         
         # Update the existing widget in place (instead of adding a new one)
-        todos = await self.data_store.list_todos(thread.id)
+        if todos is None:
+            todos = await self.data_store.list_todos(thread.id)
         widget = build_todo_widget(todos, thread.id)
         logger.info(f"Updating widget with {len(todos)} items")
         
         # Use ThreadItemUpdatedEvent with WidgetRootUpdated to update existing widget
-        if sender and hasattr(sender, 'id'):
+        if has_sender:
             yield ThreadItemUpdatedEvent(
                 item_id=sender.id,
                 update=WidgetRootUpdated(widget=widget),
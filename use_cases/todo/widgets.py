@@ -4,6 +4,8 @@ Todo Widget Builder.
 This module builds interactive ChatKit widgets for the todo list UI.
 """
 
+import functools
+
 from chatkit.widgets import (
     Card, Text, Box, Button, Row, Checkbox, Form, Input, 
     Badge, Divider, Title, Spacer
@@ -11,6 +13,79 @@ from chatkit.widgets import (
 from chatkit.actions import ActionConfig
 
 
+# ----- Static subtrees -----
+# These parts of the card are identical on every render, so they are built
+# once at import time and shared. Built widgets are treated as read-only.
+
+_HEADER_TITLE = Title(id="title", value="📋 My Todo List", size="lg")
+_HEADER_SPACER = Spacer(id="spacer1")
+
+# Divider, add-todo form and spacer shown under the header.
+# The form uses onSubmitAction on Form to capture input values.
+_STATIC_PREFIX = (
+    Divider(id="divider1"),
+    Form(
+        id="add_todo_form",
+        onSubmitAction=ActionConfig(
+            type="add_todo_form",
+            handler="server",
+        ),
+        children=[
+            Row(
+                id="form_row",
+                children=[
+                    Input(
+                        id="todo_text",
+                        placeholder="What needs to be done?",
+                        name="todo_text",
+                    ),
+                    Button(
+                        id="add_button",
+                        label="➕ Add",
+                        color="primary",
+                        submit=True,
+                    ),
+                ]
+            )
+        ]
+    ),
+    Spacer(id="spacer2"),
+)
+
+# Shown in place of the rows when the list is empty
+_EMPTY_STATE = Box(
+    id="empty_state",
+    children=[
+        Text(id="empty_icon", value="🎉", textAlign="center"),
+        Text(
+            id="empty_text", 
+            value="No todos yet! Add one above or ask me to add tasks.", 
+            textAlign="center"
+        ),
+    ]
+)
+
+# "All caught up!" message appended after the rows when nothing is pending
+_ALL_DONE_SUFFIX = (
+    Spacer(id="spacer3"),
+    Box(
+        id="all_done_state",
+        children=[
+            Row(
+                id="all_done_row",
+                children=[
+                    Text(id="all_done_icon", value="✅"),
+                    Text(
+                        id="all_done_text", 
+                        value="All caught up! No pending tasks left.",
+                    ),
+                ]
+            )
+        ]
+    ),
+)
+
+
 def build_todo_widget(todos: list, thread_id: str) -> Card:
     """
     Build an interactive todo list widget card.
@@ -27,109 +102,126 @@ def build_todo_widget(todos: list, thread_id: str) -> Card:
     Returns:
         A Card widget containing the todo list UI
     """
-    children = []
+    # Only these fields are rendered, so they alone decide the cache key
+    todos_key = tuple((t["id"], t["title"], t["completed"]) for t in todos)
+    return _build_todo_widget_cached(todos_key, thread_id)
+
+
+@functools.lru_cache(maxsize=256)
+def _build_todo_widget_cached(todos_key: tuple, thread_id: str) -> Card:
+    """
+    Build the card for a (todos, thread) state; unchanged states reuse the card.
     
-    # Header with title and stats
-    pending_count = sum(1 for t in todos if not t["completed"])
-    completed_count = sum(1 for t in todos if t["completed"])
+    Like the static subtrees, the returned Card is shared and must be
+    treated as read-only.
+    """
+    # One pass over the todos renders the rows and counts the completed ones
+    # (bool is an int)
+    rows = []
+    completed_count = 0
+    for todo_id, title, completed in todos_key:
+        completed_count += completed
+        rows.append(build_todo_row({"id": todo_id, "title": title, "completed": completed}))
+    pending_count = len(rows) - completed_count
     
-    children.append(
+    # Header with title and stats
+    children = [
         Row(
             id="header_row",
             children=[
-                Title(id="title", value="📋 My Todo List", size="lg"),
-                Spacer(id="spacer1"),
-                Badge(
-                    id="pending_badge",
-                    label=f"{pending_count} pending",
-                    color="warning",
-                ),
-                Badge(
-                    id="completed_badge", 
-                    label=f"{completed_count} done",
-                    color="info",
-                ),
-            ]
-        )
-    )
-    
-    children.append(Divider(id="divider1"))
-    
-    # Add todo form - use onSubmitAction on Form to capture input values
-    children.append(
-        Form(
-            id="add_todo_form",
-            onSubmitAction=ActionConfig(
-                type="add_todo_form",
-                handler="server",
-            ),
-            children=[
-                Row(
-                    id="form_row",
-                    children=[
-                        Input(
-                            id="todo_text",
-                            placeholder="What needs to be done?",
-                            name="todo_text",
-                        ),
-                        Button(
-                            id="add_button",
-                            label="➕ Add",
-                            color="primary",
-                            submit=True,
-                        ),
-                    ]
-                )
+                _HEADER_TITLE,
+                _HEADER_SPACER,
+                _pending_badge(pending_count),
+                _completed_badge(completed_count),
             ]
-        )
-    )
-    
-    children.append(Spacer(id="spacer2"))
+        ),
+        *_STATIC_PREFIX,
+    ]
     
     # Todo list items or empty state
-    if not todos:
-        children.append(
-            Box(
-                id="empty_state",
-                children=[
-                    Text(id="empty_icon", value="🎉", textAlign="center"),
-                    Text(
-                        id="empty_text", 
-                        value="No todos yet! Add one above or ask me to add tasks.", 
-                        textAlign="center"
-                    ),
-                ]
-            )
-        )
+    if not rows:
+        children.append(_EMPTY_STATE)
     else:
-        for todo in todos:
-            children.append(_build_todo_item(todo))
+        children.extend(rows)
         
         # Add "All caught up!" message when no pending tasks
         if pending_count == 0:
-            children.append(Spacer(id="spacer3"))
-            children.append(
-                Box(
-                    id="all_done_state",
-                    children=[
-                        Row(
-                            id="all_done_row",
-                            children=[
-                                Text(id="all_done_icon", value="✅"),
-                                Text(
-                                    id="all_done_text", 
-                                    value="All caught up! No pending tasks left.",
-                                ),
-                            ]
-                        )
-                    ]
-                )
-            )
+            children.extend(_ALL_DONE_SUFFIX)
     
     return Card(id=f"todo_widget_{thread_id}", children=children)
 
 
-def _build_todo_item(todo: dict) -> Row:
+def build_todo_row_updates(todo: dict, todos: list, card: Card | None) -> list | None:
+    """
+    Build only the components that change when a single todo is completed.
+    
+    Completing one todo changes its row and the two count badges. The rest
+    of the card stays as it is, so those three components can be sent as
+    targeted updates instead of re-rendering the whole card.
+    
+    Todos are shared across threads, so the card being patched may have
+    been rendered before other changes. It is only patched when it still
+    shows the same rows and exactly one more pending todo than now, i.e.
+    this completion is the only change since it was built.
+    
+    Args:
+        todo: The todo that changed
+        todos: The full, updated todo list (used for the header counts)
+        card: The card currently shown to the user
+        
+    Returns:
+        The replacement components (each carrying the id it replaces), or
+        None when the change needs a full rebuild, because the card is
+        stale or the "All caught up!" banner appears
+    """
+    completed_count = sum(t["completed"] for t in todos)
+    pending_count = len(todos) - completed_count
+    if pending_count == 0 or not _card_is_current(card, todos, pending_count + 1):
+        return None
+    
+    return [
+        build_todo_row(todo),
+        _pending_badge(pending_count),
+        _completed_badge(completed_count),
+    ]
+
+
+def _card_is_current(card: Card | None, todos: list, pending_count: int) -> bool:
+    """Check that a rendered card has a row per todo and the given pending count."""
+    children = getattr(card, "children", None)
+    if not children:
+        return False
+    
+    row_ids = [c.id for c in children if (c.id or "").startswith("todo_")]
+    if row_ids != [f"todo_{t['id']}" for t in todos]:
+        return False
+    
+    header = children[0]
+    if getattr(header, "id", None) != "header_row":
+        return False
+    badge = next((c for c in header.children if c.id == "pending_badge"), None)
+    return badge is not None and badge.label == _pending_badge(pending_count).label
+
+
+def _pending_badge(pending_count: int) -> Badge:
+    """Build the header badge with the number of pending todos."""
+    return Badge(
+        id="pending_badge",
+        label=f"{pending_count} pending",
+        color="warning",
+    )
+
+
+def _completed_badge(completed_count: int) -> Badge:
+    """Build the header badge with the number of completed todos."""
+    return Badge(
+        id="completed_badge", 
+        label=f"{completed_count} done",
+        color="info",
+    )
+
+
+def build_todo_row(todo: dict) -> Row:
     """
     Build a single todo item row.
     
@@ -141,6 +233,8 @@ def _build_todo_item(todo: dict) -> Row:
     """
     is_completed = todo["completed"]
     todo_id = todo["id"]
+    # All three row actions carry the same payload
+    payload = {"todo_id": todo_id}
     
     row_children = [
         Checkbox(
@@ -150,7 +244,7 @@ def _build_todo_item(todo: dict) -> Row:
             onChangeAction=ActionConfig(
                 type="toggle_todo",
                 handler="server",
-                payload={"todo_id": todo_id}
+                payload=payload
             ),
         ),
         Text(
@@ -184,7 +278,7 @@ def _build_todo_item(todo: dict) -> Row:
             onClickAction=ActionConfig(
                 type="complete_todo",
                 handler="server",
-                payload={"todo_id": todo_id}
+                payload=payload
             ),
         )
     )
@@ -200,7 +294,7 @@ def _build_todo_item(todo: dict) -> Row:
             onClickAction=ActionConfig(
                 type="delete_todo",
                 handler="server",
-                payload={"todo_id": todo_id}
+                payload=payload
             ),
         )
     )